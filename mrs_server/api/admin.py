@@ -12,8 +12,10 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 
 from mrs_server.config import settings
 from mrs_server.database import get_cursor
+from mrs_server.federation import invalidate_peer_caches
 from mrs_server.geo import compute_bounding_box
 from mrs_server.models import Location, SphereGeometry
+from mrs_server.timeutil import iso_to_us
 
 router = APIRouter(prefix="/admin")
 
@@ -35,7 +37,11 @@ async def export_database():
     that ``POST /admin/import`` will accept for a round-trip restore.
     """
     with get_cursor() as cur:
-        cur.execute("SELECT * FROM registrations ORDER BY id ASC")
+        cur.execute(
+            "SELECT id, owner, geo_type, center_lat, center_lon, center_ele, radius, "
+            "service_point, foad, origin_server, origin_id, version, created_at, updated_at "
+            "FROM registrations ORDER BY id ASC"
+        )
         reg_rows = cur.fetchall()
 
         cur.execute(
@@ -122,126 +128,144 @@ async def import_database(request: Request):
     tombstones = body.get("tombstones", [])
     peers = body.get("peers", [])
 
-    reg_count = 0
-    tomb_count = 0
-    peer_count = 0
-
-    with get_cursor() as cur:
-        for reg in registrations:
-            space = reg["space"]
-            center = space["center"]
-
-            # Recompute bounding box to guarantee consistency
-            sphere = SphereGeometry(
-                type="sphere",
-                center=Location(
-                    lat=center["lat"], lon=center["lon"], ele=center.get("ele", 0)
-                ),
-                radius=space["radius"],
-            )
-            bbox = compute_bounding_box(sphere)
-
-            cur.execute(
-                """
-                INSERT INTO registrations (
-                    id, owner, geo_type,
-                    center_lat, center_lon, center_ele, radius,
-                    service_point, foad,
-                    origin_server, origin_id, version,
-                    created_at, updated_at,
-                    bbox_min_lat, bbox_max_lat, bbox_min_lon, bbox_max_lon
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(id) DO UPDATE SET
-                    owner = excluded.owner,
-                    geo_type = excluded.geo_type,
-                    center_lat = excluded.center_lat,
-                    center_lon = excluded.center_lon,
-                    center_ele = excluded.center_ele,
-                    radius = excluded.radius,
-                    service_point = excluded.service_point,
-                    foad = excluded.foad,
-                    origin_server = excluded.origin_server,
-                    origin_id = excluded.origin_id,
-                    version = excluded.version,
-                    created_at = excluded.created_at,
-                    updated_at = excluded.updated_at,
-                    bbox_min_lat = excluded.bbox_min_lat,
-                    bbox_max_lat = excluded.bbox_max_lat,
-                    bbox_min_lon = excluded.bbox_min_lon,
-                    bbox_max_lon = excluded.bbox_max_lon
-                """,
-                (
-                    reg["id"],
-                    reg["owner"],
-                    space.get("type", "sphere"),
-                    center["lat"],
-                    center["lon"],
-                    center.get("ele", 0),
-                    space["radius"],
-                    reg.get("service_point"),
-                    int(reg.get("foad", False)),
-                    reg.get("origin_server", ""),
-                    reg.get("origin_id", reg["id"]),
-                    reg.get("version", 1),
-                    reg["created"],
-                    reg["updated"],
-                    bbox.min_lat,
-                    bbox.max_lat,
-                    bbox.min_lon,
-                    bbox.max_lon,
-                ),
+    # Build all parameter rows up front so the inserts run as batched
+    # executemany calls inside a single transaction rather than one
+    # round-trip per row.
+    reg_rows = []
+    for reg in registrations:
+        space = reg["space"]
+        center = space["center"]
+
+        # Recompute bounding box to guarantee consistency
+        sphere = SphereGeometry(
+            type="sphere",
+            center=Location(
+                lat=center["lat"], lon=center["lon"], ele=center.get("ele", 0)
+            ),
+            radius=space["radius"],
+        )
+        bbox = compute_bounding_box(sphere)
+
+        reg_rows.append(
+            (
+                reg["id"],
+                reg["owner"],
+                space.get("type", "sphere"),
+                center["lat"],
+                center["lon"],
+                center.get("ele", 0),
+                space["radius"],
+                reg.get("service_point"),
+                int(reg.get("foad", False)),
+                reg.get("origin_server", ""),
+                reg.get("origin_id", reg["id"]),
+                reg.get("version", 1),
+                reg["created"],
+                reg["updated"],
+                iso_to_us(reg["updated"]),
+                bbox.min_lat,
+                bbox.max_lat,
+                bbox.min_lon,
+                bbox.max_lon,
             )
-            reg_count += 1
+        )
 
-        for tomb in tombstones:
-            cur.execute(
-                """
-                INSERT INTO tombstones (origin_server, origin_id, version, deleted_at)
-                VALUES (?, ?, ?, ?)
-                ON CONFLICT(origin_server, origin_id) DO UPDATE SET
-                    version = MAX(tombstones.version, excluded.version),
-                    deleted_at = excluded.deleted_at
-                """,
-                (
-                    tomb["origin_server"],
-                    tomb["origin_id"],
-                    tomb["version"],
-                    tomb["deleted_at"],
-                ),
-            )
-            tomb_count += 1
+    tomb_rows = [
+        (
+            tomb["origin_server"],
+            tomb["origin_id"],
+            tomb["version"],
+            tomb["deleted_at"],
+            iso_to_us(tomb["deleted_at"]),
+        )
+        for tomb in tombstones
+    ]
 
-        for peer in peers:
-            regions_json = (
+    peer_rows = [
+        (
+            peer["server_url"],
+            peer.get("hint"),
+            peer.get("last_seen"),
+            int(peer.get("is_configured", False)),
+            (
                 json.dumps(peer["authoritative_regions"])
                 if peer.get("authoritative_regions")
                 else None
-            )
-            cur.execute(
-                """
-                INSERT INTO peers (server_url, hint, last_seen, is_configured, authoritative_regions)
-                VALUES (?, ?, ?, ?, ?)
-                ON CONFLICT(server_url) DO UPDATE SET
-                    hint = COALESCE(excluded.hint, peers.hint),
-                    last_seen = excluded.last_seen,
-                    is_configured = MAX(peers.is_configured, excluded.is_configured),
-                    authoritative_regions = COALESCE(excluded.authoritative_regions, peers.authoritative_regions)
-                """,
-                (
-                    peer["server_url"],
-                    peer.get("hint"),
-                    peer.get("last_seen"),
-                    int(peer.get("is_configured", False)),
-                    regions_json,
-                ),
-            )
-            peer_count += 1
+            ),
+        )
+        for peer in peers
+    ]
+
+    with get_cursor() as cur:
+        cur.executemany(
+            """
+            INSERT INTO registrations (
+                id, owner, geo_type,
+                center_lat, center_lon, center_ele, radius,
+                service_point, foad,
+                origin_server, origin_id, version,
+                created_at, updated_at, updated_at_us,
+                bbox_min_lat, bbox_max_lat, bbox_min_lon, bbox_max_lon
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                owner = excluded.owner,
+                geo_type = excluded.geo_type,
+                center_lat = excluded.center_lat,
+                center_lon = excluded.center_lon,
+                center_ele = excluded.center_ele,
+                radius = excluded.radius,
+                service_point = excluded.service_point,
+                foad = excluded.foad,
+                origin_server = excluded.origin_server,
+                origin_id = excluded.origin_id,
+                version = excluded.version,
+                created_at = excluded.created_at,
+                updated_at = excluded.updated_at,
+                updated_at_us = excluded.updated_at_us,
+                bbox_min_lat = excluded.bbox_min_lat,
+                bbox_max_lat = excluded.bbox_max_lat,
+                bbox_min_lon = excluded.bbox_min_lon,
+                bbox_max_lon = excluded.bbox_max_lon
+            """,
+            reg_rows,
+        )
+
+        cur.executemany(
+            """
+            INSERT INTO tombstones (origin_server, origin_id, version, deleted_at, deleted_at_us)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(origin_server, origin_id) DO UPDATE SET
+                version = MAX(tombstones.version, excluded.version),
+                deleted_at = excluded.deleted_at,
+                deleted_at_us = excluded.deleted_at_us
+            """,
+            tomb_rows,
+        )
+
+        cur.executemany(
+            """
+            INSERT INTO peers (server_url, hint, last_seen, is_configured, authoritative_regions)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(server_url) DO UPDATE SET
+                hint = COALESCE(excluded.hint, peers.hint),
+                last_seen = excluded.last_seen,
+                is_configured = MAX(peers.is_configured, excluded.is_configured),
+                authoritative_regions = COALESCE(excluded.authoritative_regions, peers.authoritative_regions)
+            """,
+            peer_rows,
+        )
+
+    if peer_rows:
+        # The upsert above bypasses add_peer, so the version-keyed peer
+        # caches (get_all_peers, referrals, /.well-known/mrs) must be
+        # told the table changed
+        invalidate_peer_caches()
 
     return {
         "status": "imported",
-        "registrations": reg_count,
-        "tombstones": tomb_count,
-        "peers": peer_count,
+        "registrations": len(reg_rows),
+        "tombstones": len(tomb_rows),
+        "peers": len(peer_rows),
     }
 
 
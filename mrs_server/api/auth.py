@@ -23,12 +23,16 @@ router = APIRouter(prefix="/auth")
 
 
 @router.post("/register", response_model=TokenResponse, status_code=201)
-async def register_user(request: UserRegisterRequest) -> TokenResponse:
+def register_user(request: UserRegisterRequest) -> TokenResponse:
     """
     Register a new user account.
 
     Creates a local user account on this server and returns a bearer token.
     The user's MRS identity will be username@server_domain.
+
+    Plain ``def`` (as is /login) so FastAPI dispatches to its thread
+    pool: bcrypt releases the GIL inside its C loop, so concurrent
+    hashes run on multiple cores instead of stalling the event loop.
     """
     try:
         identity = create_user(
@@ -45,7 +49,7 @@ async def register_user(request: UserRegisterRequest) -> TokenResponse:
 
 
 @router.post("/login", response_model=TokenResponse)
-async def login_user(request: UserLoginRequest) -> TokenResponse:
+def login_user(request: UserLoginRequest) -> TokenResponse:
     """
     Log in and get a bearer token.
 
@@ -74,7 +78,7 @@ async def get_current_user_info(
 
 
 @router.get("/me/registrations")
-async def get_my_registrations(
+def get_my_registrations(
     user: UserInfo = Depends(get_current_user),
 ):
     """
@@ -1,14 +1,16 @@
 """Registration endpoint for MRS."""
 
-import secrets
+import base64
+import os
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException
 
 from mrs_server.auth import get_current_user
 from mrs_server.config import settings
-from mrs_server.database import get_cursor
+from mrs_server.database import get_cursor, get_read_cursor
 from mrs_server.geo import compute_bounding_box
+from mrs_server.timeutil import parse_iso, to_us
 from mrs_server.models import (
     Registration,
     RegistrationRequest,
@@ -19,14 +21,43 @@ from mrs_server.models import (
 
 router = APIRouter()
 
+# Hoisted so the same statement objects are reused from the connection's
+# prepared-statement cache on every request.
+INSERT_REG_SQL = """
+    INSERT INTO registrations (
+        id, owner, geo_type,
+        center_lat, center_lon, center_ele, radius,
+        service_point, foad,
+        origin_server, origin_id, version,
+        created_at, updated_at, updated_at_us,
+        bbox_min_lat, bbox_max_lat, bbox_min_lon, bbox_max_lon
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+UPDATE_REG_SQL = """
+    UPDATE registrations SET
+        geo_type = ?,
+        center_lat = ?, center_lon = ?, center_ele = ?, radius = ?,
+        service_point = ?, foad = ?,
+        version = version + 1,
+        updated_at = ?, updated_at_us = ?,
+        bbox_min_lat = ?, bbox_max_lat = ?, bbox_min_lon = ?, bbox_max_lon = ?
+    WHERE id = ?
+"""
+
 
 def generate_registration_id() -> str:
-    """Generate a unique registration ID."""
-    return f"reg_{secrets.token_urlsafe(9)}"
+    """Generate a unique registration ID.
+
+    9 random bytes encode to exactly 12 urlsafe base64 characters with no
+    padding, so this skips the strip/replace pass token_urlsafe does on
+    top of the same os.urandom call.
+    """
+    return "reg_" + base64.urlsafe_b64encode(os.urandom(9)).decode("ascii")
 
 
 @router.post("/register", response_model=RegistrationResponse, status_code=201)
-async def create_registration(
+def create_registration(
     request: RegistrationRequest,
     user: UserInfo = Depends(get_current_user),
 ) -> RegistrationResponse:
@@ -50,14 +81,16 @@ async def create_registration(
             detail=f"radius exceeds maximum of {settings.max_radius} meters",
         )
 
-    # Check registration limit if configured
+    # Check registration limit if configured. The trigger-maintained
+    # user_reg_counts table makes this an O(1) primary-key lookup.
     if settings.max_registrations_per_user > 0:
-        with get_cursor() as cursor:
+        with get_read_cursor() as cursor:
             cursor.execute(
-                "SELECT COUNT(*) as count FROM registrations WHERE owner = ?",
+                "SELECT count FROM user_reg_counts WHERE owner = ?",
                 (user.id,),
             )
-            count = cursor.fetchone()["count"]
+            row = cursor.fetchone()
+            count = row["count"] if row else 0
             if count >= settings.max_registrations_per_user:
                 raise HTTPException(
                     status_code=400,
@@ -110,16 +143,7 @@ async def create_registration(
 
     with get_cursor() as cursor:
         cursor.execute(
-            """
-            INSERT INTO registrations (
-                id, owner, geo_type,
-                center_lat, center_lon, center_ele, radius,
-                service_point, foad,
-                origin_server, origin_id, version,
-                created_at, updated_at,
-                bbox_min_lat, bbox_max_lat, bbox_min_lon, bbox_max_lon
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+            INSERT_REG_SQL,
             (
                 reg_id,
                 user.id,
@@ -135,6 +159,7 @@ async def create_registration(
                 version,
                 now_str,
                 now_str,
+                to_us(now),
                 bbox.min_lat,
                 bbox.max_lat,
                 bbox.min_lon,
@@ -142,8 +167,9 @@ async def create_registration(
             ),
         )
 
-    # Return the registration
-    registration = Registration(
+    # Return the registration. Every field was either validated with the
+    # request or generated here, so skip re-validating on the way out.
+    registration = Registration.model_construct(
         id=reg_id,
         space=request.space,
         service_point=request.service_point,
@@ -156,11 +182,11 @@ async def create_registration(
         updated=now,
     )
 
-    return RegistrationResponse(registration=registration)
+    return RegistrationResponse.model_construct(registration=registration)
 
 
 @router.put("/register/{reg_id}", response_model=RegistrationResponse)
-async def update_registration(
+def update_registration(
     reg_id: str,
     request: RegistrationRequest,
     user: UserInfo = Depends(get_current_user),
@@ -170,7 +196,28 @@ async def update_registration(
 
     Only the owner can update a registration.
     """
-    # Fetch existing registration
+    # Validate service_point
+    if not request.foad and not request.service_point:
+        raise HTTPException(
+            status_code=400,
+            detail="service_point is required unless foad is true",
+        )
+
+    # Validate radius
+    if request.space.radius > settings.max_radius:
+        raise HTTPException(
+            status_code=400,
+            detail=f"radius exceeds maximum of {settings.max_radius} meters",
+        )
+
+    # Compute new bounding box
+    bbox = compute_bounding_box(request.space)
+    now = datetime.now(timezone.utc)
+    now_str = now.isoformat()
+
+    # Fetch-check-update in one write transaction: avoids a second
+    # transaction per update and closes the race where another writer
+    # changes the row between the ownership check and the UPDATE.
     with get_cursor() as cursor:
         cursor.execute(
             "SELECT owner, created_at, origin_server, origin_id, version FROM registrations WHERE id = ?",
@@ -202,38 +249,8 @@ async def update_registration(
         origin_id = row["origin_id"]
         current_version = int(row["version"])
 
-    # Validate service_point
-    if not request.foad and not request.service_point:
-        raise HTTPException(
-            status_code=400,
-            detail="service_point is required unless foad is true",
-        )
-
-    # Validate radius
-    if request.space.radius > settings.max_radius:
-        raise HTTPException(
-            status_code=400,
-            detail=f"radius exceeds maximum of {settings.max_radius} meters",
-        )
-
-    # Compute new bounding box
-    bbox = compute_bounding_box(request.space)
-    now = datetime.now(timezone.utc)
-    now_str = now.isoformat()
-
-    # Update registration
-    with get_cursor() as cursor:
         cursor.execute(
-            """
-            UPDATE registrations SET
-                geo_type = ?,
-                center_lat = ?, center_lon = ?, center_ele = ?, radius = ?,
-                service_point = ?, foad = ?,
-                version = version + 1,
-                updated_at = ?,
-                bbox_min_lat = ?, bbox_max_lat = ?, bbox_min_lon = ?, bbox_max_lon = ?
-            WHERE id = ?
-            """,
+            UPDATE_REG_SQL,
             (
                 request.space.type,
                 request.space.center.lat,
@@ -243,6 +260,7 @@ async def update_registration(
                 request.service_point,
                 int(request.foad),
                 now_str,
+                to_us(now),
                 bbox.min_lat,
                 bbox.max_lat,
                 bbox.min_lon,
@@ -251,8 +269,9 @@ async def update_registration(
             ),
         )
 
-    # Return updated registration
-    registration = Registration(
+    # Return updated registration; fields come from the validated request
+    # and the row we just checked, so skip re-validating on the way out.
+    registration = Registration.model_construct(
         id=reg_id,
         space=request.space,
         service_point=request.service_point,
@@ -261,11 +280,11 @@ async def update_registration(
         origin_server=origin_server,
         origin_id=origin_id,
         version=current_version + 1,
-        created=datetime.fromisoformat(created_at),
+        created=parse_iso(created_at),
         updated=now,
     )
 
-    return RegistrationResponse(registration=registration)
+    return RegistrationResponse.model_construct(registration=registration)
 
 
 def get_registration_by_id(reg_id: str) -> Registration | None:
@@ -274,8 +293,16 @@ def get_registration_by_id(reg_id: str) -> Registration | None:
 
     Utility function for other modules.
     """
-    with get_cursor() as cursor:
-        cursor.execute("SELECT * FROM registrations WHERE id = ?", (reg_id,))
+    with get_read_cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT id, owner, center_lat, center_lon, center_ele, radius,
+                   service_point, foad, origin_server, origin_id, version,
+                   created_at, updated_at
+            FROM registrations WHERE id = ?
+            """,
+            (reg_id,),
+        )
         row = cursor.fetchone()
 
         if not row:
@@ -288,23 +315,34 @@ def get_registrations_by_owner(owner: str) -> list[Registration]:
     """
     Fetch all registrations for an owner.
     """
-    with get_cursor() as cursor:
+    with get_read_cursor() as cursor:
         cursor.execute(
-            "SELECT * FROM registrations WHERE owner = ? ORDER BY created_at DESC",
+            """
+            SELECT id, owner, center_lat, center_lon, center_ele, radius,
+                   service_point, foad, origin_server, origin_id, version,
+                   created_at, updated_at
+            FROM registrations
+            WHERE owner = ? ORDER BY created_at DESC
+            """,
             (owner,),
         )
         return [_row_to_registration(row) for row in cursor.fetchall()]
 
 
 def _row_to_registration(row) -> Registration:
-    """Convert a database row to a Registration model."""
+    """Convert a database row to a Registration model.
+
+    Uses ``model_construct`` throughout: the row already passed validation
+    on the way into the database, so re-validating three nested models per
+    row only burns CPU on list-producing paths.
+    """
     from mrs_server.models import Location
 
-    return Registration(
+    return Registration.model_construct(
         id=row["id"],
-        space=SphereGeometry(
+        space=SphereGeometry.model_construct(
             type="sphere",
-            center=Location(
+            center=Location.model_construct(
                 lat=row["center_lat"],
                 lon=row["center_lon"],
                 ele=row["center_ele"],
@@ -317,6 +355,6 @@ def _row_to_registration(row) -> Registration:
         origin_server=row["origin_server"],
         origin_id=row["origin_id"],
         version=int(row["version"]),
-        created=datetime.fromisoformat(row["created_at"]),
-        updated=datetime.fromisoformat(row["updated_at"]),
+        created=parse_iso(row["created_at"]),
+        updated=parse_iso(row["updated_at"]),
     )
@@ -8,12 +8,13 @@ from mrs_server.auth import get_current_user
 from mrs_server.config import settings
 from mrs_server.database import get_cursor
 from mrs_server.models import ReleaseRequest, ReleaseResponse, UserInfo
+from mrs_server.timeutil import to_us
 
 router = APIRouter()
 
 
 @router.post("/release", response_model=ReleaseResponse)
-async def release_registration(
+def release_registration(
     request: ReleaseRequest,
     user: UserInfo = Depends(get_current_user),
 ) -> ReleaseResponse:
@@ -23,9 +24,13 @@ async def release_registration(
     Only the owner can release a registration.
     """
     with get_cursor() as cursor:
-        # Fetch the registration to verify ownership
+        # Fetch-and-delete in one statement; authorization failures raise
+        # out of the transaction, rolling the delete back.
         cursor.execute(
-            "SELECT owner, origin_server, origin_id, version FROM registrations WHERE id = ?",
+            """
+            DELETE FROM registrations WHERE id = ?
+            RETURNING owner, origin_server, origin_id, version
+            """,
             (request.id,),
         )
         row = cursor.fetchone()
@@ -49,27 +54,26 @@ async def release_registration(
                 },
             )
 
-        deleted_at = datetime.now(timezone.utc).isoformat()
+        now = datetime.now(timezone.utc)
 
         # Record tombstone for sync propagation
         cursor.execute(
             """
-            INSERT INTO tombstones (origin_server, origin_id, version, deleted_at)
-            VALUES (?, ?, ?, ?)
+            INSERT INTO tombstones (origin_server, origin_id, version, deleted_at, deleted_at_us)
+            VALUES (?, ?, ?, ?, ?)
             ON CONFLICT(origin_server, origin_id)
             DO UPDATE SET
                 version = excluded.version,
-                deleted_at = excluded.deleted_at
+                deleted_at = excluded.deleted_at,
+                deleted_at_us = excluded.deleted_at_us
             """,
             (
                 row["origin_server"],
                 row["origin_id"],
                 int(row["version"]) + 1,
-                deleted_at,
+                now.isoformat(),
+                to_us(now),
             ),
         )
 
-        # Delete the registration
-        cursor.execute("DELETE FROM registrations WHERE id = ?", (request.id,))
-
     return ReleaseResponse(id=request.id)
@@ -3,14 +3,10 @@
 from fastapi import APIRouter
 
 from mrs_server.config import settings
-from mrs_server.database import get_cursor
+from mrs_server.database import get_read_cursor
 from mrs_server.federation import generate_referrals
-from mrs_server.geo import (
-    bounding_box_for_search,
-    compute_volume,
-    haversine_distance,
-    sphere_intersects_search,
-)
+from mrs_server.geo import bounding_box_for_search
+from mrs_server.timeutil import parse_iso
 from mrs_server.models import (
     Location,
     SearchRequest,
@@ -21,9 +17,30 @@ from mrs_server.models import (
 
 router = APIRouter()
 
+# Hoisted so the same statement object is reused from the connection's
+# prepared-statement cache on every request.
+SEARCH_SQL = """
+    SELECT * FROM (
+        SELECT r.id, r.owner, r.center_lat, r.center_lon, r.center_ele,
+               r.radius, r.service_point, r.foad, r.origin_server,
+               r.origin_id, r.version, r.created_at, r.updated_at,
+               haversine_m(r.center_lat, r.center_lon, ?, ?) AS distance
+        FROM registrations_rtree AS rt
+        JOIN registrations AS r ON r.rowid = rt.id
+        WHERE r.foad = 0
+          AND rt.max_lat >= ?
+          AND rt.min_lat <= ?
+          AND rt.max_lon >= ?
+          AND rt.min_lon <= ?
+    )
+    WHERE distance <= radius + ?
+    ORDER BY radius ASC, distance ASC
+    LIMIT ?
+"""
+
 
 @router.post("/search", response_model=SearchResponse)
-async def search_registrations(request: SearchRequest) -> SearchResponse:
+def search_registrations(request: SearchRequest) -> SearchResponse:
     """
     Search for registrations near a location.
 
@@ -35,67 +52,54 @@ async def search_registrations(request: SearchRequest) -> SearchResponse:
     # Compute search bounding box for database query
     search_bbox = bounding_box_for_search(request.location, request.range)
 
-    # Query registrations with overlapping bounding boxes
-    with get_cursor() as cursor:
+    # Query registrations with overlapping bounding boxes, then apply the
+    # exact sphere intersection test and distance computation in SQL so only
+    # true matches cross back into Python. Ordering by radius is equivalent
+    # to ordering by volume (volume is monotonic in radius), and the LIMIT
+    # keeps result materialization bounded by max_results.
+    with get_read_cursor() as cursor:
         cursor.execute(
-            """
-            SELECT * FROM registrations
-            WHERE foad = 0
-              AND bbox_max_lat >= ?
-              AND bbox_min_lat <= ?
-              AND bbox_max_lon >= ?
-              AND bbox_min_lon <= ?
-            """,
+            SEARCH_SQL,
             (
+                request.location.lat,
+                request.location.lon,
                 search_bbox.min_lat,
                 search_bbox.max_lat,
                 search_bbox.min_lon,
                 search_bbox.max_lon,
+                request.range,
+                settings.max_results,
             ),
         )
         rows = cursor.fetchall()
 
-    # Filter by actual geometry intersection and compute distances
-    results = []
-    for row in rows:
-        sphere = SphereGeometry(
-            type="sphere",
-            center=Location(
-                lat=row["center_lat"],
-                lon=row["center_lon"],
-                ele=row["center_ele"],
+    # model_construct skips per-row re-validation; the rows were validated
+    # when they were written and FastAPI validates the response once more
+    # on the way out.
+    results = [
+        SearchResult.model_construct(
+            id=row["id"],
+            space=SphereGeometry.model_construct(
+                type="sphere",
+                center=Location.model_construct(
+                    lat=row["center_lat"],
+                    lon=row["center_lon"],
+                    ele=row["center_ele"],
+                ),
+                radius=row["radius"],
             ),
-            radius=row["radius"],
+            service_point=row["service_point"],
+            foad=bool(row["foad"]),
+            distance=row["distance"],
+            owner=row["owner"],
+            origin_server=row["origin_server"],
+            origin_id=row["origin_id"],
+            version=int(row["version"]),
+            created=parse_iso(row["created_at"]),
+            updated=parse_iso(row["updated_at"]),
         )
-
-        # Check actual intersection (bounding box is just an approximation)
-        if not sphere_intersects_search(sphere, request.location, request.range):
-            continue
-
-        # Compute distance from query point to sphere center
-        distance = haversine_distance(request.location, sphere.center)
-
-        results.append(
-            SearchResult(
-                id=row["id"],
-                space=sphere,
-                service_point=row["service_point"],
-                foad=bool(row["foad"]),
-                distance=distance,
-                owner=row["owner"],
-                origin_server=row["origin_server"],
-                origin_id=row["origin_id"],
-                version=int(row["version"]),
-                created=row["created_at"],
-                updated=row["updated_at"],
-            )
-        )
-
-    # Sort by volume (smallest first), then by distance
-    results.sort(key=lambda r: (compute_volume(r.space), r.distance))
-
-    # Limit results
-    results = results[: settings.max_results]
+        for row in rows
+    ]
 
     # Generate referrals to other servers
     referrals = generate_referrals(
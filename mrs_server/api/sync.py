@@ -3,128 +3,202 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from typing import Iterator
 
-from fastapi import APIRouter, Query
+import orjson
 
-from mrs_server.database import get_cursor
-from mrs_server.models import (
-    Location,
-    Registration,
-    SphereGeometry,
-    SyncChangesResponse,
-    SyncSnapshotResponse,
-    Tombstone,
-)
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from mrs_server.database import get_read_cursor
+from mrs_server.timeutil import iso_to_us
 
 router = APIRouter()
 
+# Rows fetched per fetchmany() batch while streaming
+_STREAM_BATCH = 100
+
+SNAPSHOT_FIRST_SQL = """
+    SELECT id, owner, center_lat, center_lon, center_ele, radius,
+           service_point, foad, origin_server, origin_id, version,
+           created_at, updated_at
+    FROM registrations
+    ORDER BY id ASC
+    LIMIT ?
+"""
+
+SNAPSHOT_AFTER_SQL = """
+    SELECT id, owner, center_lat, center_lon, center_ele, radius,
+           service_point, foad, origin_server, origin_id, version,
+           created_at, updated_at
+    FROM registrations
+    WHERE id > ?
+    ORDER BY id ASC
+    LIMIT ?
+"""
+
+CHANGES_REG_SQL = """
+    SELECT id, owner, center_lat, center_lon, center_ele, radius,
+           service_point, foad, origin_server, origin_id, version,
+           created_at, updated_at
+    FROM registrations
+    WHERE updated_at_us > ?
+    ORDER BY updated_at_us ASC
+    LIMIT ?
+"""
+
+CHANGES_TOMB_SQL = """
+    SELECT origin_server, origin_id, version, deleted_at
+    FROM tombstones
+    WHERE deleted_at_us > ?
+    ORDER BY deleted_at_us ASC
+    LIMIT ?
+"""
+
+
+def _row_to_dict(row) -> dict:
+    """Shape a registration row like the Registration response model."""
+    return {
+        "id": row["id"],
+        "space": {
+            "type": "sphere",
+            "center": {
+                "lat": row["center_lat"],
+                "lon": row["center_lon"],
+                "ele": row["center_ele"],
+            },
+            "radius": row["radius"],
+        },
+        "service_point": row["service_point"],
+        "foad": bool(row["foad"]),
+        "owner": row["owner"],
+        "origin_server": row["origin_server"],
+        "origin_id": row["origin_id"],
+        "version": int(row["version"]),
+        "created": row["created_at"],
+        "updated": row["updated_at"],
+    }
+
+
+def _dumps(obj) -> bytes:
+    return orjson.dumps(obj)
+
+
+def _stream_snapshot(cursor: str | None, limit: int) -> Iterator[bytes]:
+    """Yield a SyncSnapshotResponse-shaped JSON document row by row.
+
+    The DB cursor stays open across iteration so memory use is constant
+    regardless of page size and the first row goes out before the last
+    one is read.
+    """
+    with get_read_cursor() as cur:
+        if cursor:
+            cur.execute(SNAPSHOT_AFTER_SQL, (cursor, limit + 1))
+        else:
+            cur.execute(SNAPSHOT_FIRST_SQL, (limit + 1,))
+        cur.arraysize = _STREAM_BATCH
+
+        yield b'{"status":"ok","registrations":['
+
+        emitted = 0
+        last_id = None
+        has_more = False
+        while not has_more:
+            rows = cur.fetchmany()
+            if not rows:
+                break
+            for row in rows:
+                if emitted == limit:
+                    has_more = True
+                    break
+                prefix = b"," if emitted else b""
+                yield prefix + _dumps(_row_to_dict(row))
+                last_id = row["id"]
+                emitted += 1
+
+        next_cursor = last_id if has_more and last_id else None
+        yield b'],"next_cursor":' + _dumps(next_cursor) + b"}"
+
+
+def _stream_changes(since: str, since_us: int, limit: int) -> Iterator[bytes]:
+    """Yield a SyncChangesResponse-shaped JSON document row by row.
+
+    The cursor stays an ISO8601 string on the wire; internally the filter
+    runs on the indexed integer epoch columns, which order identically.
+    """
+    newest = since
 
-def _row_to_registration(row) -> Registration:
-    return Registration(
-        id=row["id"],
-        space=SphereGeometry(
-            type="sphere",
-            center=Location(
-                lat=row["center_lat"],
-                lon=row["center_lon"],
-                ele=row["center_ele"],
-            ),
-            radius=row["radius"],
-        ),
-        service_point=row["service_point"],
-        foad=bool(row["foad"]),
-        owner=row["owner"],
-        origin_server=row["origin_server"],
-        origin_id=row["origin_id"],
-        version=int(row["version"]),
-        created=datetime.fromisoformat(row["created_at"]),
-        updated=datetime.fromisoformat(row["updated_at"]),
-    )
+    with get_read_cursor() as cur:
+        cur.execute(CHANGES_REG_SQL, (since_us, limit))
+        cur.arraysize = _STREAM_BATCH
+
+        yield b'{"status":"ok","registrations":['
+        emitted = 0
+        while True:
+            rows = cur.fetchmany()
+            if not rows:
+                break
+            for row in rows:
+                prefix = b"," if emitted else b""
+                yield prefix + _dumps(_row_to_dict(row))
+                newest = max(newest, row["updated_at"])
+                emitted += 1
+
+        cur.execute(CHANGES_TOMB_SQL, (since_us, limit))
+
+        yield b'],"tombstones":['
+        emitted = 0
+        while True:
+            rows = cur.fetchmany()
+            if not rows:
+                break
+            for row in rows:
+                prefix = b"," if emitted else b""
+                yield prefix + _dumps(
+                    {
+                        "origin_server": row["origin_server"],
+                        "origin_id": row["origin_id"],
+                        "version": int(row["version"]),
+                        "deleted_at": row["deleted_at"],
+                    }
+                )
+                newest = max(newest, row["deleted_at"])
+                emitted += 1
+
+    if newest == since:
+        newest = datetime.now(timezone.utc).isoformat()
+
+    yield b'],"next_cursor":' + _dumps(newest) + b"}"
 
 
-@router.get("/sync/snapshot", response_model=SyncSnapshotResponse)
-async def get_snapshot(
+@router.get("/sync/snapshot")
+def get_snapshot(
     cursor: str | None = Query(default=None, description="Pagination cursor (registration id)"),
     limit: int = Query(default=200, ge=1, le=1000),
-) -> SyncSnapshotResponse:
-    """Return a paginated snapshot of registrations."""
-    with get_cursor() as cur:
-        if cursor:
-            cur.execute(
-                """
-                SELECT * FROM registrations
-                WHERE id > ?
-                ORDER BY id ASC
-                LIMIT ?
-                """,
-                (cursor, limit + 1),
-            )
-        else:
-            cur.execute(
-                """
-                SELECT * FROM registrations
-                ORDER BY id ASC
-                LIMIT ?
-                """,
-                (limit + 1,),
-            )
-        rows = cur.fetchall()
-
-    has_more = len(rows) > limit
-    rows = rows[:limit]
-    regs = [_row_to_registration(r) for r in rows]
-    next_cursor = rows[-1]["id"] if has_more and rows else None
-
-    return SyncSnapshotResponse(registrations=regs, next_cursor=next_cursor)
-
-
-@router.get("/sync/changes", response_model=SyncChangesResponse)
-async def get_changes(
-    since: str = Query(description="ISO8601 timestamp cursor"),
-    limit: int = Query(default=500, ge=1, le=5000),
-) -> SyncChangesResponse:
-    """Return incremental registration and tombstone changes since cursor."""
-    with get_cursor() as cur:
-        cur.execute(
-            """
-            SELECT * FROM registrations
-            WHERE updated_at > ?
-            ORDER BY updated_at ASC
-            LIMIT ?
-            """,
-            (since, limit),
-        )
-        reg_rows = cur.fetchall()
-
-        cur.execute(
-            """
-            SELECT origin_server, origin_id, version, deleted_at
-            FROM tombstones
-            WHERE deleted_at > ?
-            ORDER BY deleted_at ASC
-            LIMIT ?
-            """,
-            (since, limit),
-        )
-        tomb_rows = cur.fetchall()
-
-    regs = [_row_to_registration(r) for r in reg_rows]
-    tombs = [
-        Tombstone(
-            origin_server=r["origin_server"],
-            origin_id=r["origin_id"],
-            version=int(r["version"]),
-            deleted_at=datetime.fromisoformat(r["deleted_at"]),
-        )
-        for r in tomb_rows
-    ]
+) -> StreamingResponse:
+    """Return a paginated snapshot of registrations.
+
+    Streams a SyncSnapshotResponse-shaped JSON document.
+    """
+    return StreamingResponse(
+        _stream_snapshot(cursor, limit), media_type="application/json"
+    )
 
-    newest = since
-    if reg_rows:
-        newest = max(newest, max(r["updated_at"] for r in reg_rows))
-    if tomb_rows:
-        newest = max(newest, max(r["deleted_at"] for r in tomb_rows))
-    if newest == since:
-        newest = datetime.now(timezone.utc).isoformat()
 
-    return SyncChangesResponse(registrations=regs, tombstones=tombs, next_cursor=newest)
+@router.get("/sync/changes")
+def get_changes(
+    since: str = Query(description="ISO8601 timestamp cursor"),
+    limit: int = Query(default=500, ge=1, le=5000),
+) -> StreamingResponse:
+    """Return incremental registration and tombstone changes since cursor.
+
+    Streams a SyncChangesResponse-shaped JSON document.
+    """
+    try:
+        since_us = iso_to_us(since)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid 'since' timestamp")
+
+    return StreamingResponse(
+        _stream_changes(since, since_us, limit), media_type="application/json"
+    )
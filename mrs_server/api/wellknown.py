@@ -1,10 +1,12 @@
 """Well-known endpoints for MRS discovery."""
 
-from fastapi import APIRouter, HTTPException
+import time
 
-from mrs_server.auth import get_public_key
+from fastapi import APIRouter, HTTPException, Response
+
+from mrs_server.auth import get_public_key, keys_version
 from mrs_server.config import settings
-from mrs_server.federation import get_all_peers
+from mrs_server.federation import get_all_peers, peers_version
 from mrs_server.models import (
     KeyResponse,
     PeerInfo,
@@ -15,9 +17,21 @@ from mrs_server.models import (
 
 router = APIRouter(prefix="/.well-known/mrs")
 
+# Discovery metadata changes at peer-management cadence, but the endpoint is
+# polled frequently by federation crawlers. Cache the response and refresh
+# only when the peer set changes or the TTL expires.
+_SERVER_INFO_TTL = 60.0
+_server_info_cache: tuple[float, int, WellKnownMRS] | None = None
+
+# Public keys for an identity change only on key rotation, while federation
+# peers hit the keys endpoint to verify signatures on every inbound request.
+# Cached per identity, invalidated by the keys_version counter and the
+# configured TTL.
+_key_response_cache: dict[str, tuple[float, int, KeyResponse]] = {}
+
 
 @router.get("", response_model=WellKnownMRS)
-async def get_server_info() -> WellKnownMRS:
+def get_server_info() -> WellKnownMRS:
     """
     Get MRS server metadata.
 
@@ -25,11 +39,20 @@ async def get_server_info() -> WellKnownMRS:
     capabilities, and known peers. It's used for server discovery
     and federation.
     """
+    global _server_info_cache
+
+    now = time.monotonic()
+    version = peers_version()
+    if _server_info_cache is not None:
+        cached_at, cached_version, cached_info = _server_info_cache
+        if cached_version == version and now - cached_at < _SERVER_INFO_TTL:
+            return cached_info
+
     # Get known peers
     peers = get_all_peers()
     peer_info = [PeerInfo(server=p.server_url, hint=p.hint) for p in peers]
 
-    return WellKnownMRS(
+    info = WellKnownMRS(
         mrs_version="0.5.0",
         server=settings.server_url,
         operator=settings.admin_email,
@@ -40,10 +63,12 @@ async def get_server_info() -> WellKnownMRS:
             max_radius=settings.max_radius,
         ),
     )
+    _server_info_cache = (now, version, info)
+    return info
 
 
 @router.get("/keys/{identity}", response_model=KeyResponse)
-async def get_identity_key(identity: str) -> KeyResponse:
+def get_identity_key(identity: str, response: Response) -> KeyResponse:
     """
     Get the public key for an identity.
 
@@ -54,43 +79,49 @@ async def get_identity_key(identity: str) -> KeyResponse:
     This endpoint is used by other servers to verify HTTP signatures
     from federated identities.
     """
+    # Let upstream HTTP caches absorb repeated federation lookups too
+    response.headers["Cache-Control"] = "public, max-age=300"
+
     # Handle server key request
     if identity == "_server":
-        key_info = get_public_key("_server")
-        if not key_info:
-            raise HTTPException(status_code=404, detail="Server key not found")
-
-        return KeyResponse(
-            id=f"_server@{settings.server_domain}",
-            public_key=PublicKey(
-                type="Ed25519",
-                key=key_info["public_key_b64"],
-            ),
-            created=key_info["created_at"],
-        )
-
-    # For user keys, construct the full identity if needed
-    if "@" not in identity:
-        full_identity = f"{identity}@{settings.server_domain}"
+        full_identity = "_server"
+        response_id = f"_server@{settings.server_domain}"
     else:
-        # Verify the domain matches this server
-        _, domain = identity.split("@", 1)
-        if domain != settings.server_domain:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Identity {identity} is not managed by this server",
-            )
-        full_identity = identity
+        # For user keys, construct the full identity if needed
+        if "@" not in identity:
+            full_identity = f"{identity}@{settings.server_domain}"
+        else:
+            # Verify the domain matches this server
+            _, domain = identity.split("@", 1)
+            if domain != settings.server_domain:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Identity {identity} is not managed by this server",
+                )
+            full_identity = identity
+        response_id = full_identity
+
+    now = time.monotonic()
+    version = keys_version()
+    cached = _key_response_cache.get(full_identity)
+    if cached is not None:
+        cached_at, cached_version, cached_key = cached
+        if cached_version == version and now - cached_at < settings.key_cache_ttl_seconds:
+            return cached_key
 
     key_info = get_public_key(full_identity)
     if not key_info:
+        if full_identity == "_server":
+            raise HTTPException(status_code=404, detail="Server key not found")
         raise HTTPException(status_code=404, detail=f"Key not found for {identity}")
 
-    return KeyResponse(
-        id=full_identity,
+    key_response = KeyResponse(
+        id=response_id,
         public_key=PublicKey(
             type="Ed25519",
             key=key_info["public_key_b64"],
         ),
         created=key_info["created_at"],
     )
+    _key_response_cache[full_identity] = (now, version, key_response)
+    return key_response
@@ -12,7 +12,7 @@ from .bearer import (
     validate_token,
 )
 from .dependencies import get_current_user, get_optional_user, require_local_user
-from .keys import ensure_server_key, get_public_key, get_server_key
+from .keys import ensure_server_key, get_public_key, get_server_key, keys_version
 
 __all__ = [
     "AuthError",
@@ -30,4 +30,5 @@ __all__ = [
     "get_server_key",
     "get_public_key",
     "ensure_server_key",
+    "keys_version",
 ]
@@ -1,15 +1,65 @@
 """Bearer token authentication."""
 
-import secrets
+import base64
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 
 import bcrypt
 
 from mrs_server.config import settings
-from mrs_server.database import get_cursor
+from mrs_server.database import get_cursor, get_read_cursor
+from mrs_server.timeutil import iso_now, parse_iso
 from mrs_server.models import TokenResponse, UserInfo
 
 
+# Bounded TTL cache for validate_token, keyed by token hash. Entries are
+# (monotonic deadline, user_id, UserInfo); hits replace the SQL probe with
+# a dict lookup on the hottest path in the server. Revocations evict
+# eagerly, so the TTL only bounds staleness across processes.
+_TOKEN_CACHE_MAX = 10_000
+_token_cache: OrderedDict = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+
+def _token_cache_get(token_hash: str) -> UserInfo | None:
+    with _token_cache_lock:
+        entry = _token_cache.get(token_hash)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del _token_cache[token_hash]
+            return None
+        _token_cache.move_to_end(token_hash)
+        return entry[2]
+
+
+def _token_cache_put(token_hash: str, user: UserInfo, ttl: float) -> None:
+    if ttl <= 0:
+        return
+    with _token_cache_lock:
+        _token_cache[token_hash] = (time.monotonic() + ttl, user.id, user)
+        _token_cache.move_to_end(token_hash)
+        while len(_token_cache) > _TOKEN_CACHE_MAX:
+            _token_cache.popitem(last=False)
+
+
+def _token_cache_evict(token_hash: str) -> None:
+    with _token_cache_lock:
+        _token_cache.pop(token_hash, None)
+
+
+def _token_cache_evict_user(user_id: str) -> None:
+    with _token_cache_lock:
+        stale = [h for h, entry in _token_cache.items() if entry[1] == user_id]
+        for h in stale:
+            del _token_cache[h]
+
+
 class AuthError(Exception):
     """Authentication error."""
 
@@ -21,7 +71,9 @@ class AuthError(Exception):
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt."""
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+    return bcrypt.hashpw(
+        password.encode(), bcrypt.gensalt(settings.bcrypt_rounds)
+    ).decode()
 
 
 def verify_password(password: str, password_hash: str) -> bool:
@@ -29,9 +81,45 @@ def verify_password(password: str, password_hash: str) -> bool:
     return bcrypt.checkpw(password.encode(), password_hash.encode())
 
 
+# Verified against when a login names an unknown user, so failed logins
+# cost the same bcrypt work whether or not the account exists
+_DUMMY_HASH = bcrypt.hashpw(
+    b"dummy-password", bcrypt.gensalt(settings.bcrypt_rounds)
+).decode()
+
+
+# Per-thread buffer of CSPRNG output so token storms don't pay a
+# getrandom() syscall per token; one 4 KiB refill covers ~128 tokens
+_rng_local = threading.local()
+
+
+def random_urlsafe(nbytes: int) -> str:
+    """Return nbytes of CSPRNG output, urlsafe-base64 encoded.
+
+    Equivalent to secrets.token_urlsafe(nbytes) but slices from a
+    thread-local os.urandom buffer, amortizing the kernel RNG syscall
+    across many calls. Entropy quality is unchanged.
+    """
+    buf = getattr(_rng_local, "buf", b"")
+    if len(buf) < nbytes:
+        buf = os.urandom(4096)
+    chunk, _rng_local.buf = buf[:nbytes], buf[nbytes:]
+    return base64.urlsafe_b64encode(chunk).rstrip(b"=").decode("ascii")
+
+
 def generate_token() -> str:
     """Generate a secure random bearer token."""
-    return secrets.token_urlsafe(32)
+    return random_urlsafe(32)
+
+
+def hash_token(token: str) -> str:
+    """SHA-256 a bearer token for storage and lookup.
+
+    Only hashes ever touch the database, so a leaked database or query
+    log does not leak usable tokens, and the b-tree probe compares
+    hashes rather than token material.
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
 
 
 def check_whitelist(email: str) -> None:
@@ -73,7 +161,7 @@ def create_user(username: str, password: str, domain: str, email: str) -> str:
     check_whitelist(email)
 
     identity = f"{username}@{domain}"
-    now = datetime.now(timezone.utc).isoformat()
+    now = iso_now()
 
     with get_cursor() as cursor:
         # Check if user exists
@@ -117,37 +205,58 @@ def authenticate_user(username: str, password: str, domain: str) -> str:
         )
         row = cursor.fetchone()
 
-        if not row:
-            raise AuthError("Invalid username or password")
+    if not row:
+        # Burn the same bcrypt cost as a real verification so response
+        # timing does not reveal which usernames exist
+        verify_password(password, _DUMMY_HASH)
+        raise AuthError("Invalid username or password")
 
-        if not verify_password(password, row["password_hash"]):
-            raise AuthError("Invalid username or password")
+    if not verify_password(password, row["password_hash"]):
+        raise AuthError("Invalid username or password")
 
     return identity
 
 
-def create_token(user_id: str) -> TokenResponse:
+# The user columns are copied at issuance so validation never joins
+INSERT_TOKEN_SQL = """
+    INSERT INTO tokens (token_hash, user_id, created_at, expires_at,
+                        user_created_at, user_is_local)
+    SELECT ?, ?, ?, ?, created_at, is_local FROM users WHERE id = ?
+"""
+
+
+def create_token(user_id: str, cursor=None) -> TokenResponse:
     """
     Create a new bearer token for a user.
 
     Args:
         user_id: The MRS identity
+        cursor: Optional write cursor to join an existing transaction,
+            so bulk issuance commits once instead of per token
 
     Returns:
         TokenResponse with the token and expiry
+
+    Raises:
+        AuthError: If the user does not exist
     """
     token = generate_token()
     now = datetime.now(timezone.utc)
     expires_at = now + timedelta(hours=settings.token_expiry_hours)
-
-    with get_cursor() as cursor:
-        cursor.execute(
-            """
-            INSERT INTO tokens (token, user_id, created_at, expires_at)
-            VALUES (?, ?, ?, ?)
-            """,
-            (token, user_id, now.isoformat(), expires_at.isoformat()),
-        )
+    params = (hash_token(token), user_id, now.isoformat(), expires_at.isoformat(), user_id)
+
+    # The INSERT ... SELECT writes nothing when the user row is missing;
+    # without this check the caller would get back a token that was
+    # never persisted
+    if cursor is not None:
+        cursor.execute(INSERT_TOKEN_SQL, params)
+        if cursor.rowcount == 0:
+            raise AuthError(f"User {user_id} does not exist", 400)
+    else:
+        with get_cursor() as cur:
+            cur.execute(INSERT_TOKEN_SQL, params)
+            if cur.rowcount == 0:
+                raise AuthError(f"User {user_id} does not exist", 400)
 
     return TokenResponse(token=token, expires_at=expires_at)
 
@@ -165,33 +274,55 @@ def validate_token(token: str) -> UserInfo:
     Raises:
         AuthError: If token is invalid or expired
     """
-    with get_cursor() as cursor:
+    candidate_hash = hash_token(token)
+
+    if settings.token_cache_enabled:
+        cached = _token_cache_get(candidate_hash)
+        if cached is not None:
+            return cached
+
+    now = datetime.now(timezone.utc)
+
+    # Expiry is folded into the WHERE clause so expired tokens are
+    # indistinguishable from unknown ones and no ISO parse runs here.
+    # The denormalized user columns make this a single PK probe, no JOIN.
+    with get_read_cursor() as cursor:
         cursor.execute(
             """
-            SELECT t.user_id, t.expires_at, u.created_at, u.is_local
-            FROM tokens t
-            JOIN users u ON t.user_id = u.id
-            WHERE t.token = ?
+            SELECT token_hash, user_id, expires_at, user_created_at, user_is_local
+            FROM tokens
+            WHERE token_hash = ?
+              AND (expires_at IS NULL OR expires_at > ?)
             """,
-            (token,),
+            (candidate_hash, now.isoformat()),
         )
         row = cursor.fetchone()
 
-        if not row:
-            raise AuthError("Invalid token")
+    if not row:
+        raise AuthError("Invalid token")
 
-        if row["expires_at"]:
-            expires = datetime.fromisoformat(row["expires_at"])
-            if expires.tzinfo is None:
-                expires = expires.replace(tzinfo=timezone.utc)
-            if expires < datetime.now(timezone.utc):
-                raise AuthError("Token expired")
+    # Positional access: sqlite3.Row supports integer indexing, which
+    # skips the string-keyed lookup on the hottest query in the server
+    token_hash, user_id, expires_at, user_created_at, user_is_local = row
 
-        return UserInfo(
-            id=row["user_id"],
-            created_at=datetime.fromisoformat(row["created_at"]),
-            is_local=bool(row["is_local"]),
-        )
+    if not hmac.compare_digest(candidate_hash, token_hash):
+        raise AuthError("Invalid token")
+
+    user = UserInfo(
+        id=user_id,
+        created_at=parse_iso(user_created_at),
+        is_local=bool(user_is_local),
+    )
+
+    if settings.token_cache_enabled:
+        # Never cache past the token's own expiry
+        ttl = float(settings.token_cache_ttl_seconds)
+        if expires_at:
+            remaining = (parse_iso(expires_at) - now).total_seconds()
+            ttl = min(ttl, remaining)
+        _token_cache_put(candidate_hash, user, ttl)
+
+    return user
 
 
 def revoke_token(token: str) -> bool:
@@ -204,8 +335,10 @@ def revoke_token(token: str) -> bool:
     Returns:
         True if the token was revoked, False if it didn't exist
     """
+    token_hash = hash_token(token)
+    _token_cache_evict(token_hash)
     with get_cursor() as cursor:
-        cursor.execute("DELETE FROM tokens WHERE token = ?", (token,))
+        cursor.execute("DELETE FROM tokens WHERE token_hash = ?", (token_hash,))
         return cursor.rowcount > 0
 
 
@@ -219,6 +352,7 @@ def revoke_all_tokens(user_id: str) -> int:
     Returns:
         Number of tokens revoked
     """
+    _token_cache_evict_user(user_id)
     with get_cursor() as cursor:
         cursor.execute("DELETE FROM tokens WHERE user_id = ?", (user_id,))
         return cursor.rowcount
@@ -231,7 +365,7 @@ def cleanup_expired_tokens() -> int:
     Returns:
         Number of tokens removed
     """
-    now = datetime.now(timezone.utc).isoformat()
+    now = iso_now()
     with get_cursor() as cursor:
         cursor.execute(
             "DELETE FROM tokens WHERE expires_at IS NOT NULL AND expires_at < ?",
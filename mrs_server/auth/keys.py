@@ -6,18 +6,34 @@ and user keys. HTTP signature verification will be added in a future version.
 """
 
 import base64
-import secrets
 from datetime import datetime, timezone
 
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
 
 from mrs_server.database import get_cursor
+from mrs_server.timeutil import iso_now, parse_iso
+
+from .bearer import random_urlsafe
+
+# Bumped whenever keys are stored or deprecated, so callers caching key
+# lookups (e.g. the /.well-known/mrs/keys endpoint) can invalidate cheaply.
+_keys_version = 0
+
+
+def keys_version() -> int:
+    """Return a counter that changes whenever stored keys are modified."""
+    return _keys_version
+
+
+def _bump_keys_version() -> None:
+    global _keys_version
+    _keys_version += 1
 
 
 def generate_key_id() -> str:
     """Generate a unique key ID."""
-    return f"key_{secrets.token_urlsafe(9)}"
+    return f"key_{random_urlsafe(9)}"
 
 
 def generate_ed25519_keypair() -> tuple[bytes, bytes]:
@@ -65,12 +81,10 @@ def store_key(
         The database ID for the key
     """
     db_id = generate_key_id()
-    now = datetime.now(timezone.utc).isoformat()
-
-    public_b64 = base64.b64encode(public_key).decode()
-    private_b64 = base64.b64encode(private_key).decode() if private_key else None
+    now = iso_now()
     expires_str = expires_at.isoformat() if expires_at else None
 
+    # Keys are stored as raw BLOBs; base64 only exists at the API edge
     with get_cursor() as cursor:
         cursor.execute(
             """
@@ -78,9 +92,10 @@ def store_key(
                               created_at, expires_at, deprecated)
             VALUES (?, ?, ?, 'Ed25519', ?, ?, ?, ?, 0)
             """,
-            (db_id, owner, key_id, public_b64, private_b64, now, expires_str),
+            (db_id, owner, key_id, public_key, private_key, now, expires_str),
         )
 
+    _bump_keys_version()
     return db_id
 
 
@@ -109,9 +124,9 @@ def get_server_key() -> dict | None:
         return {
             "id": row["id"],
             "key_id": row["key_id"],
-            "public_key": base64.b64decode(row["public_key"]),
-            "private_key": base64.b64decode(row["private_key"]) if row["private_key"] else None,
-            "created_at": datetime.fromisoformat(row["created_at"]),
+            "public_key": row["public_key"],
+            "private_key": row["private_key"],
+            "created_at": parse_iso(row["created_at"]),
         }
 
 
@@ -143,11 +158,11 @@ def get_public_key(owner: str) -> dict | None:
 
         return {
             "key_id": row["key_id"],
-            "public_key": base64.b64decode(row["public_key"]),
-            "public_key_b64": row["public_key"],
-            "created_at": datetime.fromisoformat(row["created_at"]),
+            "public_key": row["public_key"],
+            "public_key_b64": base64.b64encode(row["public_key"]).decode(),
+            "created_at": parse_iso(row["created_at"]),
             "expires_at": (
-                datetime.fromisoformat(row["expires_at"]) if row["expires_at"] else None
+                parse_iso(row["expires_at"]) if row["expires_at"] else None
             ),
         }
 
@@ -195,4 +210,7 @@ def deprecate_key(owner: str, key_id: str) -> bool:
             "UPDATE keys SET deprecated = 1 WHERE owner = ? AND key_id = ?",
             (owner, key_id),
         )
-        return cursor.rowcount > 0
+        deprecated = cursor.rowcount > 0
+    if deprecated:
+        _bump_keys_version()
+    return deprecated
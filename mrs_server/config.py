@@ -4,6 +4,8 @@ Configuration management for MRS server.
 Uses pydantic-settings for environment variable loading with sensible defaults.
 """
 
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings
 
 
@@ -17,10 +19,16 @@ class Settings(BaseSettings):
 
     # Database
     database_path: str = "./mrs.db"
+    # SQLite tuning (see docs/PERFORMANCE.md); negative cache_size is KiB
+    sqlite_cache_size: int = -64000  # 64MB page cache per connection
+    sqlite_mmap_size: int = 268435456  # 256MB memory-mapped I/O
+    sqlite_busy_timeout_ms: int = 5000
+    db_pool_size: int = 0  # read connections; 0 = one per CPU core
 
     # Server options
     host: str = "0.0.0.0"
     port: int = 8000
+    workers: int = 1  # uvicorn worker processes; raise towards cpu count under load
     max_radius: float = 1_000_000  # meters (1000km max)
     max_results: int = 100
     max_registrations_per_user: int = 0  # 0 = unlimited
@@ -30,6 +38,11 @@ class Settings(BaseSettings):
 
     # Auth
     token_expiry_hours: int = 24 * 7  # 1 week default
+    # bcrypt work factor; 12 is the production floor. Tests dial it down
+    # (MRS_BCRYPT_ROUNDS=4) because KDF cost dominates auth-heavy suites.
+    bcrypt_rounds: int = 12
+    token_cache_enabled: bool = True
+    token_cache_ttl_seconds: int = 60
     key_cache_ttl_seconds: int = 3600  # 1 hour
     registration_requires_whitelist: bool = False  # require email in whitelist to register
 
@@ -43,5 +56,20 @@ class Settings(BaseSettings):
     }
 
 
-# Global settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build (once) and return the process-wide Settings instance.
+
+    The .env read and pydantic validation run on first access rather than
+    at import, and tests can reset with ``get_settings.cache_clear()``.
+    """
+    return Settings()
+
+
+def __getattr__(name: str) -> Settings:
+    # Lazy module attribute: `from mrs_server.config import settings`
+    # keeps working but doesn't pay for Settings() until something
+    # actually imports it.
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
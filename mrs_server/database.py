@@ -2,16 +2,51 @@
 Database module for MRS server.
 
 Provides SQLite database initialization, connection management, and schema setup.
+
+Connections run in WAL mode with a pool of read-only connections plus a single
+dedicated writer, so searches and sync reads proceed concurrently with writes
+and writers never see SQLITE_BUSY from each other.
 """
 
+import os
+import queue
 import sqlite3
+import threading
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Generator
 
-# Module-level connection for the application
-_db_path: Path | None = None
-_connection: sqlite3.Connection | None = None
+from mrs_server.config import settings
+from mrs_server.geo.distance import haversine
+from mrs_server.timeutil import iso_to_us
+
+# Module-level connection state for the application. The path may also be
+# a SQLite URI ("file:...?..."), e.g. a shared-cache in-memory database.
+_db_path: Path | str | None = None
+_read_pool: queue.Queue | None = None
+_write_conn: sqlite3.Connection | None = None
+_write_lock = threading.Lock()
+
+def _read_pool_size() -> int:
+    """Number of pooled read connections.
+
+    One reader per core is enough to saturate SQLite on this workload;
+    settings.db_pool_size overrides for unusual deployments.
+    """
+    return settings.db_pool_size or os.cpu_count() or 4
+
+# Performance tuning applied to every connection. WAL allows concurrent
+# readers alongside the single writer; NORMAL sync is safe under WAL.
+# The sizing pragmas are settings-driven so ops can tune without a release.
+def _tuning_pragmas() -> tuple[str, ...]:
+    return (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        f"PRAGMA cache_size={settings.sqlite_cache_size}",
+        f"PRAGMA mmap_size={settings.sqlite_mmap_size}",
+        f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+    )
 
 
 SCHEMA = """
@@ -39,6 +74,7 @@ CREATE TABLE IF NOT EXISTS registrations (
     -- Metadata
     created_at TEXT NOT NULL,               -- ISO 8601
     updated_at TEXT NOT NULL,               -- ISO 8601
+    updated_at_us INTEGER NOT NULL DEFAULT 0, -- epoch microseconds, sync cursor
 
     -- Spatial index helpers (precomputed bounding box)
     bbox_min_lat REAL NOT NULL,
@@ -47,11 +83,66 @@ CREATE TABLE IF NOT EXISTS registrations (
     bbox_max_lon REAL NOT NULL
 );
 
-CREATE INDEX IF NOT EXISTS idx_registrations_bbox ON registrations(
-    bbox_min_lat, bbox_max_lat, bbox_min_lon, bbox_max_lon
-);
 CREATE INDEX IF NOT EXISTS idx_registrations_owner ON registrations(owner);
-CREATE INDEX IF NOT EXISTS idx_registrations_updated ON registrations(updated_at);
+CREATE INDEX IF NOT EXISTS idx_registrations_owner_created ON registrations(owner, created_at DESC);
+-- idx_registrations_updated_us is created in _ensure_epoch_columns, after
+-- the updated_at_us column is guaranteed to exist on legacy databases
+
+-- Per-owner registration counts, maintained by triggers so the quota
+-- check in /register is an O(1) lookup instead of a COUNT(*) scan
+CREATE TABLE IF NOT EXISTS user_reg_counts (
+    owner TEXT PRIMARY KEY,
+    count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_reg_count_insert
+AFTER INSERT ON registrations
+BEGIN
+    INSERT INTO user_reg_counts (owner, count) VALUES (NEW.owner, 1)
+    ON CONFLICT(owner) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_reg_count_delete
+AFTER DELETE ON registrations
+BEGIN
+    UPDATE user_reg_counts SET count = count - 1 WHERE owner = OLD.owner;
+END;
+
+-- R*Tree over the registration bounding boxes: the search prefilter
+-- becomes a 2D tree descent instead of a range scan on a composite
+-- b-tree index. Keyed by registrations.rowid and maintained by the
+-- triggers below. The R*Tree stores coordinates as 32-bit floats
+-- rounded outward, which can only widen a box, so the bbox
+-- never-excludes invariant survives the narrowing.
+CREATE VIRTUAL TABLE IF NOT EXISTS registrations_rtree USING rtree(
+    id,
+    min_lat, max_lat,
+    min_lon, max_lon
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_reg_rtree_insert
+AFTER INSERT ON registrations
+BEGIN
+    INSERT INTO registrations_rtree (id, min_lat, max_lat, min_lon, max_lon)
+    VALUES (NEW.rowid, NEW.bbox_min_lat, NEW.bbox_max_lat,
+            NEW.bbox_min_lon, NEW.bbox_max_lon);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_reg_rtree_update
+AFTER UPDATE OF bbox_min_lat, bbox_max_lat, bbox_min_lon, bbox_max_lon
+ON registrations
+BEGIN
+    UPDATE registrations_rtree
+    SET min_lat = NEW.bbox_min_lat, max_lat = NEW.bbox_max_lat,
+        min_lon = NEW.bbox_min_lon, max_lon = NEW.bbox_max_lon
+    WHERE id = NEW.rowid;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_reg_rtree_delete
+AFTER DELETE ON registrations
+BEGIN
+    DELETE FROM registrations_rtree WHERE id = OLD.rowid;
+END;
 
 -- Tombstones: propagated deletes for sync consistency
 CREATE TABLE IF NOT EXISTS tombstones (
@@ -59,11 +150,10 @@ CREATE TABLE IF NOT EXISTS tombstones (
     origin_id TEXT NOT NULL,
     version INTEGER NOT NULL,
     deleted_at TEXT NOT NULL,
+    deleted_at_us INTEGER NOT NULL DEFAULT 0, -- epoch microseconds, sync cursor
     PRIMARY KEY (origin_server, origin_id)
 );
 
-CREATE INDEX IF NOT EXISTS idx_tombstones_deleted_at ON tombstones(deleted_at);
-
 -- Users: local and federated identities
 CREATE TABLE IF NOT EXISTS users (
     id TEXT PRIMARY KEY,                    -- MRS identity (user@domain)
@@ -89,8 +179,8 @@ CREATE TABLE IF NOT EXISTS keys (
     owner TEXT NOT NULL,                    -- MRS identity or "_server" for server key
     key_id TEXT NOT NULL,                   -- human-readable key identifier
     algorithm TEXT NOT NULL DEFAULT 'Ed25519',
-    public_key TEXT NOT NULL,               -- base64-encoded
-    private_key TEXT,                       -- base64-encoded, only for local identities
+    public_key BLOB NOT NULL,               -- raw key bytes
+    private_key BLOB,                       -- raw key bytes, only for local identities
     created_at TEXT NOT NULL,
     expires_at TEXT,
     deprecated INTEGER NOT NULL DEFAULT 0,
@@ -100,13 +190,20 @@ CREATE TABLE IF NOT EXISTS keys (
 
 CREATE INDEX IF NOT EXISTS idx_keys_owner ON keys(owner);
 
--- Tokens: bearer tokens for authentication
+-- Tokens: bearer tokens for authentication. Only the SHA-256 of the
+-- token is stored, so a leaked database does not leak usable tokens
+-- and the index probe never touches token material.
 CREATE TABLE IF NOT EXISTS tokens (
-    token TEXT PRIMARY KEY,                 -- random bearer token
+    token_hash TEXT PRIMARY KEY,            -- SHA-256 hex of the bearer token
     user_id TEXT NOT NULL,
     created_at TEXT NOT NULL,
     expires_at TEXT,
 
+    -- Copied from users at issuance so validate_token is a single
+    -- PK probe with no JOIN; these never change for a local user
+    user_created_at TEXT,
+    user_is_local INTEGER,
+
     FOREIGN KEY (user_id) REFERENCES users(id)
 );
 
@@ -134,25 +231,231 @@ def _ensure_registration_columns(conn: sqlite3.Connection) -> None:
     cur = conn.execute("PRAGMA table_info(registrations)")
     cols = {row[1] for row in cur.fetchall()}
 
+    added = False
     if "origin_server" not in cols:
         conn.execute(
             "ALTER TABLE registrations ADD COLUMN origin_server TEXT NOT NULL DEFAULT ''"
         )
+        added = True
     if "origin_id" not in cols:
         conn.execute(
             "ALTER TABLE registrations ADD COLUMN origin_id TEXT NOT NULL DEFAULT ''"
         )
+        added = True
     if "version" not in cols:
         conn.execute(
             "ALTER TABLE registrations ADD COLUMN version INTEGER NOT NULL DEFAULT 1"
         )
+        added = True
+
+    # Backfill defaults for legacy rows — but only on the boot that adds
+    # the columns; re-running these unconditionally scans the whole table
+    # on every startup for nothing
+    if added:
+        conn.execute(
+            "UPDATE registrations SET origin_server = '' WHERE origin_server IS NULL"
+        )
+        conn.execute(
+            "UPDATE registrations SET origin_id = id WHERE origin_id IS NULL OR origin_id = ''"
+        )
+        conn.execute(
+            "UPDATE registrations SET version = 1 WHERE version IS NULL OR version < 1"
+        )
+
+
+def _ensure_token_hashes(conn: sqlite3.Connection) -> None:
+    """Migrate a legacy plaintext tokens table to hashed storage.
+
+    Rebuilds the table with token_hash as the primary key, hashing the
+    existing tokens in place so issued tokens keep working.
+    """
+    cur = conn.execute("PRAGMA table_info(tokens)")
+    cols = {row[1] for row in cur.fetchall()}
+    if "token_hash" in cols or "token" not in cols:
+        return
+
+    from mrs_server.auth.bearer import hash_token
+
+    conn.execute("ALTER TABLE tokens RENAME TO tokens_plaintext")
+    conn.execute(
+        """
+        CREATE TABLE tokens (
+            token_hash TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            expires_at TEXT,
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+        """
+    )
+    rows = conn.execute(
+        "SELECT token, user_id, created_at, expires_at FROM tokens_plaintext"
+    ).fetchall()
+    conn.executemany(
+        "INSERT INTO tokens (token_hash, user_id, created_at, expires_at) VALUES (?, ?, ?, ?)",
+        [
+            (hash_token(row["token"]), row["user_id"], row["created_at"], row["expires_at"])
+            for row in rows
+        ],
+    )
+    conn.execute("DROP TABLE tokens_plaintext")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tokens_user ON tokens(user_id)")
+
+
+def _ensure_token_user_columns(conn: sqlite3.Connection) -> None:
+    """Ensure the denormalized user columns on tokens exist."""
+    cur = conn.execute("PRAGMA table_info(tokens)")
+    cols = {row[1] for row in cur.fetchall()}
+    if "user_created_at" in cols:
+        return
 
-    # Backfill defaults for legacy rows
+    conn.execute("ALTER TABLE tokens ADD COLUMN user_created_at TEXT")
+    conn.execute("ALTER TABLE tokens ADD COLUMN user_is_local INTEGER")
     conn.execute(
-        "UPDATE registrations SET origin_server = '' WHERE origin_server IS NULL"
+        """
+        UPDATE tokens SET
+            user_created_at = (SELECT created_at FROM users WHERE id = tokens.user_id),
+            user_is_local = (SELECT is_local FROM users WHERE id = tokens.user_id)
+        """
+    )
+
+
+def _ensure_key_blobs(conn: sqlite3.Connection) -> None:
+    """Migrate a legacy keys table storing base64 TEXT to raw BLOBs.
+
+    Ed25519 keys are 32 bytes; storing them raw drops the 33% base64
+    inflation and the encode/decode transform on every key lookup.
+    """
+    cur = conn.execute("PRAGMA table_info(keys)")
+    col_types = {row[1]: (row[2] or "").upper() for row in cur.fetchall()}
+    if not col_types or col_types.get("public_key") == "BLOB":
+        return
+
+    import base64
+
+    rows = conn.execute(
+        "SELECT id, owner, key_id, algorithm, public_key, private_key, "
+        "created_at, expires_at, deprecated FROM keys"
+    ).fetchall()
+    conn.execute("DROP TABLE keys")
+    conn.execute(
+        """
+        CREATE TABLE keys (
+            id TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            key_id TEXT NOT NULL,
+            algorithm TEXT NOT NULL DEFAULT 'Ed25519',
+            public_key BLOB NOT NULL,
+            private_key BLOB,
+            created_at TEXT NOT NULL,
+            expires_at TEXT,
+            deprecated INTEGER NOT NULL DEFAULT 0,
+            UNIQUE(owner, key_id)
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_keys_owner ON keys(owner)")
+    conn.executemany(
+        "INSERT INTO keys (id, owner, key_id, algorithm, public_key, private_key, "
+        "created_at, expires_at, deprecated) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                row["id"],
+                row["owner"],
+                row["key_id"],
+                row["algorithm"],
+                base64.b64decode(row["public_key"]),
+                base64.b64decode(row["private_key"]) if row["private_key"] else None,
+                row["created_at"],
+                row["expires_at"],
+                row["deprecated"],
+            )
+            for row in rows
+        ],
     )
-    conn.execute("UPDATE registrations SET origin_id = id WHERE origin_id IS NULL OR origin_id = ''")
-    conn.execute("UPDATE registrations SET version = 1 WHERE version IS NULL OR version < 1")
+
+
+def _ensure_epoch_columns(conn: sqlite3.Connection) -> None:
+    """Ensure the integer epoch columns used as sync cursors exist.
+
+    updated_at_us / deleted_at_us mirror the ISO8601 TEXT columns as epoch
+    microseconds so incremental sync filters on an indexed integer instead
+    of comparing strings.
+    """
+    cur = conn.execute("PRAGMA table_info(registrations)")
+    reg_cols = {row[1] for row in cur.fetchall()}
+    cur = conn.execute("PRAGMA table_info(tombstones)")
+    tomb_cols = {row[1] for row in cur.fetchall()}
+
+    reg_added = "updated_at_us" not in reg_cols
+    tomb_added = "deleted_at_us" not in tomb_cols
+    if reg_added:
+        conn.execute(
+            "ALTER TABLE registrations ADD COLUMN updated_at_us INTEGER NOT NULL DEFAULT 0"
+        )
+    if tomb_added:
+        conn.execute(
+            "ALTER TABLE tombstones ADD COLUMN deleted_at_us INTEGER NOT NULL DEFAULT 0"
+        )
+
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_registrations_updated_us "
+        "ON registrations(updated_at_us)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tombstones_deleted_us "
+        "ON tombstones(deleted_at_us)"
+    )
+
+    # The TEXT-column indexes are superseded by the integer ones
+    conn.execute("DROP INDEX IF EXISTS idx_registrations_updated")
+    conn.execute("DROP INDEX IF EXISTS idx_tombstones_deleted_at")
+
+    # Backfill legacy rows from the ISO strings, only on the boot that adds
+    # the columns (one-time, done in Python because SQLite's strftime drops
+    # sub-second precision)
+    if reg_added:
+        rows = conn.execute(
+            "SELECT id, updated_at FROM registrations WHERE updated_at_us = 0"
+        ).fetchall()
+        if rows:
+            conn.executemany(
+                "UPDATE registrations SET updated_at_us = ? WHERE id = ?",
+                [(iso_to_us(row["updated_at"]), row["id"]) for row in rows],
+            )
+    if tomb_added:
+        rows = conn.execute(
+            "SELECT origin_server, origin_id, deleted_at FROM tombstones WHERE deleted_at_us = 0"
+        ).fetchall()
+        if rows:
+            conn.executemany(
+                "UPDATE tombstones SET deleted_at_us = ? WHERE origin_server = ? AND origin_id = ?",
+                [
+                    (iso_to_us(row["deleted_at"]), row["origin_server"], row["origin_id"])
+                    for row in rows
+                ],
+            )
+
+
+def _ensure_rtree(conn: sqlite3.Connection) -> None:
+    """Rebuild the spatial R*Tree if it has drifted from registrations.
+
+    Databases written by versions without the sync triggers come up with
+    an empty (or stale) R*Tree; a row-count mismatch triggers a one-time
+    rebuild from the stored bounding boxes.
+    """
+    (regs,) = conn.execute("SELECT COUNT(*) FROM registrations").fetchone()
+    (indexed,) = conn.execute("SELECT COUNT(*) FROM registrations_rtree").fetchone()
+    if regs != indexed:
+        conn.execute("DELETE FROM registrations_rtree")
+        conn.execute(
+            "INSERT INTO registrations_rtree (id, min_lat, max_lat, min_lon, max_lon) "
+            "SELECT rowid, bbox_min_lat, bbox_max_lat, bbox_min_lon, bbox_max_lon "
+            "FROM registrations"
+        )
+
+    # The composite bbox b-tree index is superseded by the R*Tree
+    conn.execute("DROP INDEX IF EXISTS idx_registrations_bbox")
 
 
 def _ensure_user_columns(conn: sqlite3.Connection) -> None:
@@ -164,52 +467,151 @@ def _ensure_user_columns(conn: sqlite3.Connection) -> None:
         conn.execute("ALTER TABLE users ADD COLUMN email TEXT")
 
 
+def _connect(db_path: Path | str, read_only: bool = False) -> sqlite3.Connection:
+    """Open a tuned connection to the database.
+
+    Connections are opened in autocommit mode (isolation_level=None) so the
+    writer can issue explicit BEGIN IMMEDIATE and readers never hold
+    transactions open between requests. Pool readers open with mode=ro so
+    a stray write on a read connection fails loudly instead of contending
+    for the write lock.
+    """
+    # cached_statements keeps prepared statements for the hot queries
+    # resident per connection, avoiding re-parse/re-plan on every request.
+    if isinstance(db_path, str) and db_path.startswith("file:"):
+        # Caller-supplied URI (the test suite uses shared-cache in-memory
+        # databases). Honor any mode it already carries — an in-memory
+        # database cannot also be opened mode=ro.
+        target = db_path
+        if read_only and "mode=" not in target:
+            target += ("&" if "?" in target else "?") + "mode=ro"
+        uri = True
+    else:
+        target = f"file:{db_path}?mode=ro" if read_only else str(db_path)
+        uri = read_only
+    conn = sqlite3.connect(
+        target,
+        uri=uri,
+        check_same_thread=False,
+        isolation_level=None,
+        cached_statements=512,
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    for pragma in _tuning_pragmas():
+        conn.execute(pragma)
+
+    # Expose haversine to SQL so geometry filtering happens inside queries
+    # instead of a Python loop over candidate rows.
+    conn.create_function("haversine_m", 4, haversine, deterministic=True)
+    return conn
+
+
 def init_database(db_path: str | Path) -> None:
     """Initialize the database with the MRS schema."""
-    global _db_path, _connection
+    global _db_path, _read_pool, _write_conn
 
-    _db_path = Path(db_path)
-    _connection = sqlite3.connect(str(_db_path), check_same_thread=False)
-    _connection.row_factory = sqlite3.Row
+    close_database()
 
-    # Enable foreign keys
-    _connection.execute("PRAGMA foreign_keys = ON")
+    if isinstance(db_path, str) and db_path.startswith("file:"):
+        _db_path = db_path  # SQLite URI, keep verbatim
+    else:
+        _db_path = Path(db_path)
+    _write_conn = _connect(_db_path)
 
     # Create schema
-    _connection.executescript(SCHEMA)
-    _ensure_registration_columns(_connection)
-    _ensure_user_columns(_connection)
-    _connection.commit()
+    _write_conn.executescript(SCHEMA)
+    _ensure_registration_columns(_write_conn)
+    _ensure_user_columns(_write_conn)
+    _ensure_token_hashes(_write_conn)
+    _ensure_token_user_columns(_write_conn)
+    _ensure_key_blobs(_write_conn)
+    _ensure_epoch_columns(_write_conn)
+    _ensure_rtree(_write_conn)
+
+    # Rebuild the denormalized counts so they stay correct even if rows
+    # were written by an older version without the triggers
+    _write_conn.execute("DELETE FROM user_reg_counts")
+    _write_conn.execute(
+        "INSERT INTO user_reg_counts (owner, count) "
+        "SELECT owner, COUNT(*) FROM registrations GROUP BY owner"
+    )
+    _write_conn.commit()
+
+    # Pre-open the read pool (after the writer has established WAL mode)
+    pool_size = _read_pool_size()
+    _read_pool = queue.Queue(maxsize=pool_size)
+    for _ in range(pool_size):
+        _read_pool.put(_connect(_db_path, read_only=True))
 
 
 def get_connection() -> sqlite3.Connection:
-    """Get the current database connection."""
-    if _connection is None:
+    """Get the writer database connection."""
+    if _write_conn is None:
         raise RuntimeError("Database not initialized. Call init_database() first.")
-    return _connection
+    return _write_conn
 
 
 @contextmanager
-def get_cursor() -> Generator[sqlite3.Cursor, None, None]:
-    """Get a database cursor with automatic commit/rollback."""
+def get_write_cursor() -> Generator[sqlite3.Cursor, None, None]:
+    """Get a cursor on the single writer connection.
+
+    Serializes writers, takes the SQLite write lock upfront with
+    BEGIN IMMEDIATE, and commits/rolls back automatically.
+    """
     conn = get_connection()
+    with _write_lock:
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            yield cursor
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+
+@contextmanager
+def get_read_cursor() -> Generator[sqlite3.Cursor, None, None]:
+    """Get a cursor on a pooled read connection.
+
+    Readers run concurrently with each other and with the writer thanks
+    to WAL mode. Must not be used for statements that modify the database.
+    """
+    if _read_pool is None:
+        raise RuntimeError("Database not initialized. Call init_database() first.")
+    conn = _read_pool.get()
     cursor = conn.cursor()
     try:
         yield cursor
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
     finally:
         cursor.close()
+        _read_pool.put(conn)
+
+
+@contextmanager
+def get_cursor() -> Generator[sqlite3.Cursor, None, None]:
+    """Get a writer cursor with automatic commit/rollback.
+
+    Kept as the general-purpose entry point for mixed read/write call
+    sites; hot read-only paths should prefer get_read_cursor().
+    """
+    with get_write_cursor() as cursor:
+        yield cursor
 
 
 def close_database() -> None:
-    """Close the database connection."""
-    global _connection
-    if _connection is not None:
-        _connection.close()
-        _connection = None
+    """Close all database connections."""
+    global _read_pool, _write_conn
+    if _write_conn is not None:
+        _write_conn.close()
+        _write_conn = None
+    if _read_pool is not None:
+        while not _read_pool.empty():
+            _read_pool.get_nowait().close()
+        _read_pool = None
 
 
 def get_config(key: str) -> str | None:
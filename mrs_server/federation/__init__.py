@@ -6,7 +6,9 @@ from .peers import (
     get_all_peers,
     get_configured_peers,
     get_peer,
+    invalidate_peer_caches,
     learn_peer_from_referral,
+    peers_version,
     remove_peer,
     update_peer_last_seen,
 )
@@ -20,6 +22,8 @@ __all__ = [
     "get_all_peers",
     "get_configured_peers",
     "update_peer_last_seen",
+    "invalidate_peer_caches",
     "learn_peer_from_referral",
+    "peers_version",
     "generate_referrals",
 ]
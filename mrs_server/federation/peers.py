@@ -1,15 +1,48 @@
 """Peer management for MRS federation."""
 
-import json
+import threading
+import time
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime
 
-from mrs_server.database import get_cursor
+import orjson
 
+from mrs_server.database import get_cursor, get_read_cursor
+from mrs_server.timeutil import iso_now, parse_iso
 
-@dataclass
+# Bumped whenever the peer table changes, so callers caching peer-derived
+# data (e.g. the /.well-known/mrs response) can invalidate cheaply.
+_peers_version = 0
+
+
+def peers_version() -> int:
+    """Return a counter that changes whenever the peer set is modified."""
+    return _peers_version
+
+
+def _bump_peers_version() -> None:
+    global _peers_version
+    _peers_version += 1
+
+
+def invalidate_peer_caches() -> None:
+    """Signal that the peers table was modified outside this module.
+
+    Bulk writers (e.g. /admin/import) upsert the peers table directly
+    rather than going through add_peer per row; they must call this
+    afterwards so get_all_peers and everything keyed on peers_version()
+    (referrals, the /.well-known/mrs response) pick up the new rows.
+    """
+    _bump_peers_version()
+
+
+@dataclass(slots=True, frozen=True)
 class Peer:
-    """A known MRS peer server."""
+    """A known MRS peer server.
+
+    Slotted and frozen: instances are allocated per row in get_all_peers
+    and shared through its cache, so they should be compact and immutable.
+    """
 
     server_url: str
     hint: str | None
@@ -18,11 +51,23 @@ class Peer:
     authoritative_regions: list | None
 
 
+ADD_PEER_SQL = """
+    INSERT INTO peers (server_url, hint, last_seen, is_configured, authoritative_regions)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(server_url) DO UPDATE SET
+        hint = COALESCE(excluded.hint, hint),
+        last_seen = excluded.last_seen,
+        is_configured = MAX(is_configured, excluded.is_configured),
+        authoritative_regions = COALESCE(excluded.authoritative_regions, authoritative_regions)
+"""
+
+
 def add_peer(
     server_url: str,
     hint: str | None = None,
     is_configured: bool = False,
     authoritative_regions: list | None = None,
+    cursor=None,
 ) -> None:
     """
     Add or update a known peer.
@@ -32,23 +77,20 @@ def add_peer(
         hint: Human-readable description
         is_configured: True if manually configured (bootstrap peer)
         authoritative_regions: List of geometry objects the peer claims
+        cursor: Optional write cursor to join an existing transaction,
+            so bulk peer ingestion commits once instead of per peer
     """
-    now = datetime.now(timezone.utc).isoformat()
-    regions_json = json.dumps(authoritative_regions) if authoritative_regions else None
+    now = iso_now()
+    # orjson emits bytes; sqlite3 stores them without another copy
+    regions_json = orjson.dumps(authoritative_regions) if authoritative_regions else None
+    params = (server_url, hint, now, int(is_configured), regions_json)
 
-    with get_cursor() as cursor:
-        cursor.execute(
-            """
-            INSERT INTO peers (server_url, hint, last_seen, is_configured, authoritative_regions)
-            VALUES (?, ?, ?, ?, ?)
-            ON CONFLICT(server_url) DO UPDATE SET
-                hint = COALESCE(excluded.hint, hint),
-                last_seen = excluded.last_seen,
-                is_configured = MAX(is_configured, excluded.is_configured),
-                authoritative_regions = COALESCE(excluded.authoritative_regions, authoritative_regions)
-            """,
-            (server_url, hint, now, int(is_configured), regions_json),
-        )
+    if cursor is not None:
+        cursor.execute(ADD_PEER_SQL, params)
+    else:
+        with get_cursor() as cur:
+            cur.execute(ADD_PEER_SQL, params)
+    _bump_peers_version()
 
 
 def remove_peer(server_url: str) -> bool:
@@ -63,7 +105,10 @@ def remove_peer(server_url: str) -> bool:
     """
     with get_cursor() as cursor:
         cursor.execute("DELETE FROM peers WHERE server_url = ?", (server_url,))
-        return cursor.rowcount > 0
+        removed = cursor.rowcount > 0
+    if removed:
+        _bump_peers_version()
+    return removed
 
 
 def get_peer(server_url: str) -> Peer | None:
@@ -76,8 +121,9 @@ def get_peer(server_url: str) -> Peer | None:
     Returns:
         Peer object or None if not found
     """
-    with get_cursor() as cursor:
-        cursor.execute("SELECT * FROM peers WHERE server_url = ?", (server_url,))
+    with get_read_cursor() as cursor:
+        cursor.execute("SELECT server_url, hint, last_seen, is_configured, authoritative_regions "
+            "FROM peers WHERE server_url = ?", (server_url,))
         row = cursor.fetchone()
 
         if not row:
@@ -86,6 +132,13 @@ def get_peer(server_url: str) -> Peer | None:
         return _row_to_peer(row)
 
 
+# Materialized get_all_peers result, rebuilt when peers_version() changes,
+# so searches don't re-parse timestamps and region JSON for every peer row
+_peer_cache: list[Peer] | None = None
+_peer_cache_version: int = -1
+_peer_cache_lock = threading.Lock()
+
+
 def get_all_peers() -> list[Peer]:
     """
     Get all known peers.
@@ -93,14 +146,27 @@ def get_all_peers() -> list[Peer]:
     Returns:
         List of peers, configured peers first, then by last_seen
     """
-    with get_cursor() as cursor:
+    global _peer_cache, _peer_cache_version
+
+    version = _peers_version
+    cached = _peer_cache
+    if cached is not None and version == _peer_cache_version:
+        return cached
+
+    with get_read_cursor() as cursor:
         cursor.execute(
             """
-            SELECT * FROM peers
+            SELECT server_url, hint, last_seen, is_configured, authoritative_regions
+            FROM peers
             ORDER BY is_configured DESC, last_seen DESC
             """
         )
-        return [_row_to_peer(row) for row in cursor.fetchall()]
+        peers = [_row_to_peer(row) for row in cursor.fetchall()]
+
+    with _peer_cache_lock:
+        _peer_cache = peers
+        _peer_cache_version = version
+    return peers
 
 
 def get_configured_peers() -> list[Peer]:
@@ -110,23 +176,41 @@ def get_configured_peers() -> list[Peer]:
     Returns:
         List of configured peers
     """
-    with get_cursor() as cursor:
-        cursor.execute("SELECT * FROM peers WHERE is_configured = 1")
+    with get_read_cursor() as cursor:
+        cursor.execute("SELECT server_url, hint, last_seen, is_configured, authoritative_regions "
+            "FROM peers WHERE is_configured = 1")
         return [_row_to_peer(row) for row in cursor.fetchall()]
 
 
+# Monotonic time of the last last_seen write per peer, for debouncing
+_last_seen_written: dict[str, float] = {}
+
+# last_seen is informational; one write per peer per window is plenty
+_LAST_SEEN_DEBOUNCE_S = 30.0
+
+
 def update_peer_last_seen(server_url: str) -> None:
     """
     Update the last_seen timestamp for a peer.
 
-    Called when we successfully communicate with a peer.
+    Called on every successful communication with a peer, so writes are
+    debounced to at most one transaction per peer per 30s window —
+    federation-heavy traffic would otherwise pay a WAL commit per request
+    for a timestamp nobody needs at sub-minute precision.
     """
-    now = datetime.now(timezone.utc).isoformat()
+    mono = time.monotonic()
+    last = _last_seen_written.get(server_url)
+    if last is not None and mono - last < _LAST_SEEN_DEBOUNCE_S:
+        return
+    _last_seen_written[server_url] = mono
+
+    now = iso_now()
     with get_cursor() as cursor:
         cursor.execute(
             "UPDATE peers SET last_seen = ? WHERE server_url = ?",
             (now, server_url),
         )
+    _bump_peers_version()
 
 
 def learn_peer_from_referral(server_url: str, hint: str | None = None) -> None:
@@ -148,11 +232,11 @@ def _row_to_peer(row) -> Peer:
         server_url=row["server_url"],
         hint=row["hint"],
         last_seen=(
-            datetime.fromisoformat(row["last_seen"]) if row["last_seen"] else None
+            parse_iso(row["last_seen"]) if row["last_seen"] else None
         ),
         is_configured=bool(row["is_configured"]),
         authoritative_regions=(
-            json.loads(row["authoritative_regions"])
+            orjson.loads(row["authoritative_regions"])
             if row["authoritative_regions"]
             else None
         ),
@@ -1,8 +1,61 @@
 """Referral generation for federated search."""
 
+import threading
+from math import cos, radians
+
+from mrs_server.geo import haversine_rad_cos
 from mrs_server.models import Location, Referral
 
-from .peers import Peer, get_all_peers
+from .peers import get_all_peers, peers_version
+
+# Flattened view of the peer table for referral generation: one tuple of
+# (server_url, hint, is_configured, ((rlat, rlon, cos_rlat, radius), ...))
+# per peer, with region JSON decoded and validated once, coordinates
+# converted to radians and cos(lat) precomputed up front — the query point
+# converts once per search, so the per-region comparison pays only the sin
+# terms and the asin/sqrt. Rebuilt lazily whenever peers_version() changes,
+# so the per-search loop touches only floats.
+_peer_index: list = []
+_peer_index_version: int = -1
+_peer_index_lock = threading.Lock()
+
+
+def _build_peer_index() -> list:
+    index = []
+    for peer in get_all_peers():
+        regions = []
+        for region in peer.authoritative_regions or ():
+            # Currently only support sphere regions
+            if region.get("type") != "sphere":
+                continue
+            try:
+                rlat = radians(float(region["center"]["lat"]))
+                regions.append(
+                    (
+                        rlat,
+                        radians(float(region["center"]["lon"])),
+                        cos(rlat),
+                        float(region["radius"]),
+                    )
+                )
+            except (KeyError, TypeError, ValueError):
+                # Invalid region data, skip it
+                continue
+        index.append(
+            (peer.server_url, peer.hint, peer.is_configured, tuple(regions))
+        )
+    return index
+
+
+def _get_peer_index() -> list:
+    global _peer_index, _peer_index_version
+    version = peers_version()
+    if version != _peer_index_version:
+        with _peer_index_lock:
+            if version != _peer_index_version:
+                _peer_index = _build_peer_index()
+                _peer_index_version = version
+    return _peer_index
 
 
 def generate_referrals(
@@ -30,69 +83,29 @@ def generate_referrals(
     """
     exclude_servers = exclude_servers or set()
     referrals = []
-    peers = get_all_peers()
+    rlat = radians(location.lat)
+    rlon = radians(location.lon)
+    cos_rlat = cos(rlat)
 
-    for peer in peers:
+    for server_url, hint, is_configured, regions in _get_peer_index():
         # Skip excluded servers
-        if peer.server_url in exclude_servers:
+        if server_url in exclude_servers:
             continue
 
         # Always include configured peers
-        if peer.is_configured:
-            referrals.append(
-                Referral(server=peer.server_url, hint=peer.hint)
-            )
+        if is_configured:
+            referrals.append(Referral(server=server_url, hint=hint))
             continue
 
-        # For learned peers, check if they claim authority over relevant region
-        if peer.authoritative_regions:
-            if _peer_covers_area(peer, location, search_range):
-                referrals.append(
-                    Referral(server=peer.server_url, hint=peer.hint)
-                )
+        # For learned peers, check if they claim authority over a region
+        # intersecting the search area (sphere-vs-sphere, as in
+        # geo.sphere_intersects_search, but on the predecoded floats)
+        for region_rlat, region_rlon, region_cos, region_radius in regions:
+            if (
+                haversine_rad_cos(region_rlat, region_rlon, region_cos, rlat, rlon, cos_rlat)
+                <= region_radius + search_range
+            ):
+                referrals.append(Referral(server=server_url, hint=hint))
+                break
 
     return referrals
-
-
-def _peer_covers_area(peer: Peer, location: Location, search_range: float) -> bool:
-    """
-    Check if a peer's authoritative regions intersect the search area.
-
-    For now, this is a simple check. A more sophisticated implementation
-    would do proper geometry intersection testing.
-
-    Args:
-        peer: The peer to check
-        location: Search center
-        search_range: Search radius in meters
-
-    Returns:
-        True if the peer might have relevant data
-    """
-    if not peer.authoritative_regions:
-        return False
-
-    # Import here to avoid circular dependency
-    from mrs_server.geo import sphere_intersects_search
-    from mrs_server.models import SphereGeometry
-
-    for region in peer.authoritative_regions:
-        # Currently only support sphere regions
-        if region.get("type") == "sphere":
-            try:
-                sphere = SphereGeometry(
-                    type="sphere",
-                    center=Location(
-                        lat=region["center"]["lat"],
-                        lon=region["center"]["lon"],
-                        ele=region["center"].get("ele", 0),
-                    ),
-                    radius=region["radius"],
-                )
-                if sphere_intersects_search(sphere, location, search_range):
-                    return True
-            except (KeyError, ValueError):
-                # Invalid region data, skip it
-                continue
-
-    return False
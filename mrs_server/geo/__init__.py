@@ -2,7 +2,13 @@
 
 from .bbox import bounding_box_for_search, bounding_boxes_intersect, compute_bounding_box
 from .constants import EARTH_RADIUS_M
-from .distance import distance_3d, haversine_distance
+from .distance import (
+    distance_3d,
+    haversine,
+    haversine_distance,
+    haversine_rad,
+    haversine_rad_cos,
+)
 from .intersect import (
     compute_volume,
     sphere_contains_point,
@@ -12,7 +18,10 @@ from .intersect import (
 
 __all__ = [
     "EARTH_RADIUS_M",
+    "haversine",
     "haversine_distance",
+    "haversine_rad",
+    "haversine_rad_cos",
     "distance_3d",
     "compute_bounding_box",
     "bounding_box_for_search",
@@ -1,29 +1,21 @@
 """Bounding box computation for spatial indexing."""
 
 import math
+from functools import lru_cache
 
 from mrs_server.models import BoundingBox, Location, SphereGeometry
 
 from .constants import EARTH_RADIUS_M
 
 
-def compute_bounding_box(geometry: SphereGeometry) -> BoundingBox:
-    """
-    Compute an axis-aligned bounding box for a sphere geometry.
-
-    The bounding box is used for efficient spatial indexing in the database.
-    It's an approximation that may include areas outside the actual sphere,
-    but will never exclude areas inside the sphere.
+@lru_cache(maxsize=4096)
+def _bounding_box(lat: float, lon: float, radius: float) -> BoundingBox:
+    """Float-keyed core of compute_bounding_box.
 
-    Args:
-        geometry: A sphere geometry
-
-    Returns:
-        Bounding box that contains the entire sphere
+    Pure over (lat, lon, radius), so results are memoized: federated
+    ingestion and repeated searches around popular locations recompute
+    the same boxes constantly, and a cache hit skips the trig entirely.
     """
-    center = geometry.center
-    radius = geometry.radius
-
     # Convert radius in meters to degrees latitude
     # This is constant regardless of longitude
     lat_delta = (radius / EARTH_RADIUS_M) * (180 / math.pi)
@@ -32,20 +24,37 @@ def compute_bounding_box(geometry: SphereGeometry) -> BoundingBox:
     # This varies with latitude - at higher latitudes, degrees of longitude
     # cover less distance, so we need more degrees for the same radius
     # Handle edge case near poles where cos approaches 0
-    cos_lat = math.cos(math.radians(center.lat))
+    cos_lat = math.cos(math.radians(lat))
     if cos_lat < 0.001:  # Very close to pole
         lon_delta = 180  # Entire longitude range
     else:
         lon_delta = lat_delta / cos_lat
 
     return BoundingBox(
-        min_lat=max(-90, center.lat - lat_delta),
-        max_lat=min(90, center.lat + lat_delta),
-        min_lon=max(-180, center.lon - lon_delta),
-        max_lon=min(180, center.lon + lon_delta),
+        min_lat=max(-90, lat - lat_delta),
+        max_lat=min(90, lat + lat_delta),
+        min_lon=max(-180, lon - lon_delta),
+        max_lon=min(180, lon + lon_delta),
     )
 
 
+def compute_bounding_box(geometry: SphereGeometry) -> BoundingBox:
+    """
+    Compute an axis-aligned bounding box for a sphere geometry.
+
+    The bounding box is used for efficient spatial indexing in the database.
+    It's an approximation that may include areas outside the actual sphere,
+    but will never exclude areas inside the sphere.
+
+    Args:
+        geometry: A sphere geometry
+
+    Returns:
+        Bounding box that contains the entire sphere
+    """
+    return _bounding_box(geometry.center.lat, geometry.center.lon, geometry.radius)
+
+
 def bounding_box_for_search(location: Location, range_m: float) -> BoundingBox:
     """
     Compute a bounding box for a search query.
@@ -57,9 +66,12 @@ def bounding_box_for_search(location: Location, range_m: float) -> BoundingBox:
     Returns:
         Bounding box for the search area
     """
-    # Create a temporary sphere geometry to reuse the computation
-    temp_geo = SphereGeometry(type="sphere", center=location, radius=range_m)
-    return compute_bounding_box(temp_geo)
+    # Shares the memoized core with compute_bounding_box, so repeated
+    # searches from the same spot (static service endpoints polling) hit
+    # the cache. Keys are the exact floats: quantizing them would buy more
+    # hits but could shrink the box below the true search area, breaking
+    # the never-excludes invariant.
+    return _bounding_box(location.lat, location.lon, range_m)
 
 
 def bounding_boxes_intersect(box1: BoundingBox, box2: BoundingBox) -> bool:
@@ -73,9 +85,11 @@ def bounding_boxes_intersect(box1: BoundingBox, box2: BoundingBox) -> bool:
     Returns:
         True if the boxes overlap
     """
-    # Check for no overlap conditions
-    if box1.max_lat < box2.min_lat or box1.min_lat > box2.max_lat:
-        return False
-    if box1.max_lon < box2.min_lon or box1.min_lon > box2.max_lon:
-        return False
-    return True
+    # Single separating-axis expression instead of staged if/return:
+    # one comparison per edge, no intermediate branches to mispredict
+    return (
+        box1.max_lat >= box2.min_lat
+        and box1.min_lat <= box2.max_lat
+        and box1.max_lon >= box2.min_lon
+        and box1.min_lon <= box2.max_lon
+    )
@@ -6,6 +6,158 @@ from mrs_server.models import Location
 
 from .constants import EARTH_RADIUS_M
 
+# Bound at module load so the per-row SQL callback pays local-variable
+# lookups instead of attribute lookups on the math module
+_radians = math.radians
+_sin = math.sin
+_cos = math.cos
+_asin = math.asin
+_sqrt = math.sqrt
+
+
+def haversine(
+    lat1: float,
+    lon1: float,
+    lat2: float,
+    lon2: float,
+    _radians=_radians,
+    _sin=_sin,
+    _cos=_cos,
+    _asin=_asin,
+    _sqrt=_sqrt,
+) -> float:
+    """
+    Calculate the great-circle distance between two coordinate pairs.
+
+    Float-based core of haversine_distance; also registered as the
+    ``haversine_m`` SQL function so geometry filtering can run inside
+    SQLite queries. The trailing defaults freeze the math functions as
+    locals — this is the hottest pure-Python code in the server, called
+    once per candidate row in every search.
+
+    Args:
+        lat1: First latitude in degrees
+        lon1: First longitude in degrees
+        lat2: Second latitude in degrees
+        lon2: Second longitude in degrees
+
+    Returns:
+        Distance in meters
+    """
+    rlat1 = _radians(lat1)
+    rlat2 = _radians(lat2)
+
+    sin_dlat = _sin((rlat2 - rlat1) * 0.5)
+    sin_dlon = _sin((_radians(lon2) - _radians(lon1)) * 0.5)
+
+    a = sin_dlat * sin_dlat + _cos(rlat1) * _cos(rlat2) * sin_dlon * sin_dlon
+    return EARTH_RADIUS_M * 2 * _asin(_sqrt(a))
+
+
+def haversine_rad(
+    rlat1: float,
+    rlon1: float,
+    rlat2: float,
+    rlon2: float,
+    _sin=_sin,
+    _cos=_cos,
+    _asin=_asin,
+    _sqrt=_sqrt,
+) -> float:
+    """
+    Haversine distance over coordinates already converted to radians.
+
+    For callers that compare one point against many stored candidates:
+    convert the stored set to radians once when it is built, convert the
+    query point once per request, and each comparison then skips all four
+    degree-to-radian conversions that ``haversine`` would repeat.
+
+    Args:
+        rlat1: First latitude in radians
+        rlon1: First longitude in radians
+        rlat2: Second latitude in radians
+        rlon2: Second longitude in radians
+
+    Returns:
+        Distance in meters
+    """
+    sin_dlat = _sin((rlat2 - rlat1) * 0.5)
+    sin_dlon = _sin((rlon2 - rlon1) * 0.5)
+
+    a = sin_dlat * sin_dlat + _cos(rlat1) * _cos(rlat2) * sin_dlon * sin_dlon
+    return EARTH_RADIUS_M * 2 * _asin(_sqrt(a))
+
+
+def haversine_rad_cos(
+    rlat1: float,
+    rlon1: float,
+    cos1: float,
+    rlat2: float,
+    rlon2: float,
+    cos2: float,
+    _sin=_sin,
+    _asin=_asin,
+    _sqrt=_sqrt,
+) -> float:
+    """
+    Haversine distance with pre-converted radians and precomputed cosines.
+
+    The last precomputation rung after ``haversine_rad``: ``cos(lat)`` of
+    a stored candidate never changes, so callers holding a candidate set
+    can cache it alongside the radian coordinates and pay only the two
+    ``sin`` terms and the ``asin``/``sqrt`` per comparison.
+
+    Args:
+        rlat1: First latitude in radians
+        rlon1: First longitude in radians
+        cos1: Precomputed cos(rlat1)
+        rlat2: Second latitude in radians
+        rlon2: Second longitude in radians
+        cos2: Precomputed cos(rlat2)
+
+    Returns:
+        Distance in meters
+    """
+    sin_dlat = _sin((rlat2 - rlat1) * 0.5)
+    sin_dlon = _sin((rlon2 - rlon1) * 0.5)
+
+    a = sin_dlat * sin_dlat + cos1 * cos2 * sin_dlon * sin_dlon
+    return EARTH_RADIUS_M * 2 * _asin(_sqrt(a))
+
+
+def haversine_a(
+    lat1: float,
+    lon1: float,
+    lat2: float,
+    lon2: float,
+    _radians=_radians,
+    _sin=_sin,
+    _cos=_cos,
+) -> float:
+    """
+    The haversine "a" term, before the final ``2 * asin(sqrt(a))``.
+
+    ``a`` is monotone in distance, so threshold tests can compare it
+    directly against a threshold mapped into the same space (see
+    ``intersect.threshold_a``) and skip the ``asin``/``sqrt`` entirely.
+
+    Args:
+        lat1: First latitude in degrees
+        lon1: First longitude in degrees
+        lat2: Second latitude in degrees
+        lon2: Second longitude in degrees
+
+    Returns:
+        The dimensionless haversine term in [0, 1]
+    """
+    rlat1 = _radians(lat1)
+    rlat2 = _radians(lat2)
+
+    sin_dlat = _sin((rlat2 - rlat1) * 0.5)
+    sin_dlon = _sin((_radians(lon2) - _radians(lon1)) * 0.5)
+
+    return sin_dlat * sin_dlat + _cos(rlat1) * _cos(rlat2) * sin_dlon * sin_dlon
+
 
 def haversine_distance(loc1: Location, loc2: Location) -> float:
     """
@@ -20,18 +172,7 @@ def haversine_distance(loc1: Location, loc2: Location) -> float:
     Returns:
         Distance in meters
     """
-    lat1 = math.radians(loc1.lat)
-    lon1 = math.radians(loc1.lon)
-    lat2 = math.radians(loc2.lat)
-    lon2 = math.radians(loc2.lon)
-
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-
-    a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
-    c = 2 * math.asin(math.sqrt(a))
-
-    return EARTH_RADIUS_M * c
+    return haversine(loc1.lat, loc1.lon, loc2.lat, loc2.lon)
 
 
 def distance_3d(loc1: Location, loc2: Location) -> float:
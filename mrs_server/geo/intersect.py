@@ -1,8 +1,38 @@
 """Geometry intersection tests."""
 
+import math
+
 from mrs_server.models import Location, SphereGeometry
 
-from .distance import haversine_distance
+from .constants import EARTH_RADIUS_M
+from .distance import haversine_a
+
+_INV_2R = 1.0 / (2 * EARTH_RADIUS_M)
+
+# Beyond half the circumference every point on the sphere is within range
+_MAX_THRESHOLD_M = math.pi * EARTH_RADIUS_M
+
+
+def threshold_a(threshold_m: float) -> float:
+    """
+    Map a distance threshold in meters into haversine "a" space.
+
+    ``distance <= threshold`` is equivalent to comparing the raw haversine
+    term against ``sin(threshold / 2R)**2``, because both sides of the
+    original comparison pass through the same monotone ``2R * asin(sqrt())``.
+    Hoisting the transform to the threshold side means each candidate test
+    pays one extra ``sin`` here instead of an ``asin`` plus a ``sqrt`` there.
+
+    Args:
+        threshold_m: Distance threshold in meters
+
+    Returns:
+        The equivalent threshold for the haversine "a" term
+    """
+    if threshold_m >= _MAX_THRESHOLD_M:
+        return 1.0
+    s = math.sin(threshold_m * _INV_2R)
+    return s * s
 
 
 def sphere_contains_point(sphere: SphereGeometry, point: Location) -> bool:
@@ -16,8 +46,9 @@ def sphere_contains_point(sphere: SphereGeometry, point: Location) -> bool:
     Returns:
         True if the point is within the sphere's radius of its center
     """
-    distance = haversine_distance(sphere.center, point)
-    return distance <= sphere.radius
+    center = sphere.center
+    a = haversine_a(center.lat, center.lon, point.lat, point.lon)
+    return a <= threshold_a(sphere.radius)
 
 
 def spheres_intersect(sphere1: SphereGeometry, sphere2: SphereGeometry) -> bool:
@@ -31,8 +62,10 @@ def spheres_intersect(sphere1: SphereGeometry, sphere2: SphereGeometry) -> bool:
     Returns:
         True if the spheres overlap
     """
-    distance = haversine_distance(sphere1.center, sphere2.center)
-    return distance <= (sphere1.radius + sphere2.radius)
+    c1 = sphere1.center
+    c2 = sphere2.center
+    a = haversine_a(c1.lat, c1.lon, c2.lat, c2.lon)
+    return a <= threshold_a(sphere1.radius + sphere2.radius)
 
 
 def sphere_intersects_search(
@@ -52,8 +85,9 @@ def sphere_intersects_search(
     Returns:
         True if the sphere overlaps the search area
     """
-    distance = haversine_distance(sphere.center, search_center)
-    return distance <= (sphere.radius + search_range)
+    center = sphere.center
+    a = haversine_a(center.lat, center.lon, search_center.lat, search_center.lon)
+    return a <= threshold_a(sphere.radius + search_range)
 
 
 def compute_volume(sphere: SphereGeometry) -> float:
@@ -68,6 +102,4 @@ def compute_volume(sphere: SphereGeometry) -> float:
     Returns:
         Volume in cubic meters
     """
-    import math
-
     return (4 / 3) * math.pi * (sphere.radius**3)
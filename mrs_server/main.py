@@ -11,12 +11,13 @@ from contextlib import asynccontextmanager
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from mrs_server import __version__
 from mrs_server.api import api_router
 from mrs_server.auth.keys import ensure_server_key
 from mrs_server.config import settings
-from mrs_server.database import close_database, init_database
+from mrs_server.database import close_database, get_cursor, init_database
 from mrs_server.federation import add_peer
 
 # Configure logging
@@ -47,10 +48,12 @@ async def lifespan(app: FastAPI):
     server_key = ensure_server_key()
     logger.info(f"Server key: {server_key['key_id']}")
 
-    # Load configured bootstrap peers
-    for peer_url in settings.bootstrap_peers:
-        add_peer(peer_url, is_configured=True)
-        logger.info(f"Added bootstrap peer: {peer_url}")
+    # Load configured bootstrap peers in a single transaction
+    if settings.bootstrap_peers:
+        with get_cursor() as cursor:
+            for peer_url in settings.bootstrap_peers:
+                add_peer(peer_url, is_configured=True, cursor=cursor)
+                logger.info(f"Added bootstrap peer: {peer_url}")
 
     yield
 
@@ -67,13 +70,18 @@ app = FastAPI(
     lifespan=lifespan,
     docs_url="/docs",
     redoc_url="/redoc",
+    # orjson is much faster than stdlib json for float-heavy payloads
+    # like search results
+    default_response_class=ORJSONResponse,
 )
 
-# Add CORS middleware for browser clients
+# Add CORS middleware for browser clients. Credentials stay off: auth is
+# bearer-token, not cookies, and without them Starlette serves the
+# wildcard origin as a static header instead of echoing and varying on
+# the Origin of every request.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Configure appropriately for production
-    allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
@@ -119,17 +127,37 @@ def run():
         action="store_true",
         help="Enable auto-reload for development"
     )
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=None,
+        help=f"Number of worker processes (default: {settings.workers}, or MRS_WORKERS env var)"
+    )
     args = parser.parse_args()
 
     # Command line args override config/env vars
     host = args.host if args.host is not None else settings.host
     port = args.port if args.port is not None else settings.port
-
+    workers = args.workers if args.workers is not None else settings.workers
+
+    if args.reload and workers > 1:
+        parser.error("--reload cannot be combined with multiple workers")
+
+    # Each worker opens its own reader pool and writer connection; with the
+    # database in WAL mode, writers across workers coordinate through the
+    # file-level SQLite write lock.
+    # uvicorn[standard]'s "auto" would pick these anyway when installed;
+    # naming them makes startup fail loudly if the C event loop or HTTP
+    # parser ever goes missing instead of silently falling back to the
+    # slower pure-Python asyncio/h11 pair.
     uvicorn.run(
         "mrs_server.main:app",
         host=host,
         port=port,
         reload=args.reload,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
     )
 
 
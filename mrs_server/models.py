@@ -5,7 +5,7 @@ These models define the request/response structures for the MRS API.
 """
 
 from datetime import datetime
-from typing import Literal
+from typing import Literal, NamedTuple
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -38,8 +38,14 @@ class SphereGeometry(BaseModel):
 SpaceGeometry = SphereGeometry
 
 
-class BoundingBox(BaseModel):
-    """Axis-aligned bounding box for spatial indexing."""
+class BoundingBox(NamedTuple):
+    """Axis-aligned bounding box for spatial indexing.
+
+    Never serialized over the wire, so it is a NamedTuple rather than a
+    BaseModel: construction and field access are C-level tuple operations,
+    which matters because one is built per registration write and per
+    search request.
+    """
 
     min_lat: float
     max_lat: float
@@ -0,0 +1,46 @@
+"""Timestamp helpers shared across modules.
+
+Registrations, tokens, and peers all store ISO8601 strings in SQLite, so
+reading them back means parsing the same timestamps over and over —
+batch-imported rows in particular share identical ``created_at`` values.
+A small LRU cache in front of ``datetime.fromisoformat`` turns repeat
+parses into dict lookups.
+"""
+
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+
+parse_iso = lru_cache(maxsize=8192)(datetime.fromisoformat)
+
+
+def to_us(dt: datetime) -> int:
+    """Convert a datetime to integer epoch microseconds."""
+    return int(dt.timestamp() * 1_000_000)
+
+
+def iso_to_us(timestamp: str) -> int:
+    """Convert an ISO8601 string to integer epoch microseconds."""
+    return to_us(parse_iso(timestamp))
+
+
+_iso_now_cache: tuple[int, str] = (0, "")
+
+
+def iso_now() -> str:
+    """Current UTC time as an ISO8601 string, cached per wall-clock second.
+
+    For bookkeeping timestamps (token/user creation, peer last_seen) that
+    don't feed ordering or cursors, reformatting within the same second is
+    pure waste; sub-second callers should format their own datetime. The
+    unsynchronized cache update is a benign race — both writers produce a
+    string for the same second.
+    """
+    global _iso_now_cache
+    sec = int(time.time())
+    cached = _iso_now_cache
+    if cached[0] == sec:
+        return cached[1]
+    formatted = datetime.now(timezone.utc).isoformat()
+    _iso_now_cache = (sec, formatted)
+    return formatted
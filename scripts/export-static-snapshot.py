@@ -4,10 +4,11 @@
 from __future__ import annotations
 
 import argparse
-import json
 from datetime import datetime, timezone
 from pathlib import Path
 
+import orjson
+
 from mrs_server.database import init_database, get_cursor, close_database
 
 
@@ -19,7 +20,13 @@ def main() -> int:
 
     init_database(args.db)
     try:
-        with get_cursor() as cur:
+        out = Path(args.out)
+        count = 0
+
+        # Stream rows straight to disk in fetchmany batches: peak memory
+        # stays flat no matter how many registrations the database holds,
+        # instead of materializing every row as a dict before serializing.
+        with get_cursor() as cur, out.open("wb") as fh:
             cur.execute(
                 """
                 SELECT id, owner, center_lat, center_lon, center_ele, radius,
@@ -29,42 +36,51 @@ def main() -> int:
                 ORDER BY updated_at DESC
                 """
             )
-            rows = cur.fetchall()
 
-        regs = []
-        for r in rows:
-            regs.append(
-                {
-                    "id": r["id"],
-                    "space": {
-                        "type": "sphere",
-                        "center": {
-                            "lat": r["center_lat"],
-                            "lon": r["center_lon"],
-                            "ele": r["center_ele"],
-                        },
-                        "radius": r["radius"],
-                    },
-                    "service_point": r["service_point"],
-                    "foad": bool(r["foad"]),
-                    "owner": r["owner"],
-                    "origin_server": r["origin_server"],
-                    "origin_id": r["origin_id"],
-                    "version": int(r["version"]),
-                    "created": r["created_at"],
-                    "updated": r["updated_at"],
-                }
+            generated_at = datetime.now(timezone.utc).isoformat()
+            fh.write(
+                b'{"mrs_static_version":"0.1","generated_at":'
+                + orjson.dumps(generated_at)
+                + b',"registrations":['
             )
 
-        payload = {
-            "mrs_static_version": "0.1",
-            "generated_at": datetime.now(timezone.utc).isoformat(),
-            "registrations": regs,
-        }
+            while True:
+                rows = cur.fetchmany(10_000)
+                if not rows:
+                    break
+                chunk = b",".join(
+                    orjson.dumps(
+                        {
+                            "id": r["id"],
+                            "space": {
+                                "type": "sphere",
+                                "center": {
+                                    "lat": r["center_lat"],
+                                    "lon": r["center_lon"],
+                                    "ele": r["center_ele"],
+                                },
+                                "radius": r["radius"],
+                            },
+                            "service_point": r["service_point"],
+                            "foad": bool(r["foad"]),
+                            "owner": r["owner"],
+                            "origin_server": r["origin_server"],
+                            "origin_id": r["origin_id"],
+                            "version": int(r["version"]),
+                            "created": r["created_at"],
+                            "updated": r["updated_at"],
+                        }
+                    )
+                    for r in rows
+                )
+                if count:
+                    fh.write(b",")
+                fh.write(chunk)
+                count += len(rows)
 
-        out = Path(args.out)
-        out.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-        print(f"Wrote {len(regs)} registrations to {out}")
+            fh.write(b"]}")
+
+        print(f"Wrote {count} registrations to {out}")
         return 0
     finally:
         close_database()
@@ -0,0 +1,142 @@
+"""Direct-database helpers for test setup.
+
+For tests whose assertions don't inspect the /register response, writing
+rows straight to the database in one transaction skips the HTTP round
+trips and per-request commits. Tests that cross-check register responses
+against later reads should keep going through the API.
+"""
+
+from datetime import datetime, timezone
+
+from mrs_server.api.register import INSERT_REG_SQL, generate_registration_id
+from mrs_server.database import get_cursor
+from mrs_server.geo import compute_bounding_box
+from mrs_server.models import Location, SphereGeometry
+from mrs_server.timeutil import parse_iso, to_us
+
+
+# Replica tests only care that the row exists, not when it was written,
+# so a fixed timestamp avoids a clock read per insert and keeps the rows
+# reproducible across runs
+FIXED_TS = "2024-01-01T00:00:00+00:00"
+FIXED_TS_US = to_us(parse_iso(FIXED_TS))
+
+# Module-level constant so SQLite's per-connection statement cache hits
+# when both replica tests run on the same writer connection
+REPLICA_INSERT_SQL = """
+    INSERT INTO registrations (
+        id, owner, geo_type,
+        center_lat, center_lon, center_ele, radius,
+        service_point, foad,
+        origin_server, origin_id, version,
+        created_at, updated_at, updated_at_us,
+        bbox_min_lat, bbox_max_lat, bbox_min_lon, bbox_max_lon
+    ) VALUES (?, ?, 'sphere', ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def insert_replica(
+    reg_id: str,
+    origin_id: str,
+    *,
+    version: int = 3,
+    service_point: str = "https://example.com/replica",
+    origin_server: str = "https://origin.example",
+) -> str:
+    """Insert a replicated (non-authoritative) registration directly.
+
+    Owned by whichever user the test's auth fixture created — resolved
+    from the tokens table inside the same transaction as the insert.
+
+    Returns:
+        The owner identity the row was attributed to.
+    """
+    with get_cursor() as cur:
+        cur.execute(
+            "SELECT id FROM users WHERE id = (SELECT user_id FROM tokens LIMIT 1)"
+        )
+        owner = cur.fetchone()["id"]
+        cur.execute(
+            REPLICA_INSERT_SQL,
+            (
+                reg_id,
+                owner,
+                -33.8568,
+                151.2153,
+                0.0,
+                50.0,
+                service_point,
+                0,
+                origin_server,
+                origin_id,
+                version,
+                FIXED_TS,
+                FIXED_TS,
+                FIXED_TS_US,
+                -33.8573,
+                -33.8563,
+                151.2148,
+                151.2158,
+            ),
+        )
+    return owner
+
+
+def bulk_register(
+    specs,
+    owner: str = "bulk@testserver",
+    origin_server: str = "http://testserver",
+) -> list[str]:
+    """Insert registrations in a single transaction, bypassing HTTP.
+
+    Each spec is a dict with lat, lon, radius and optionally ele,
+    service_point, foad. Reuses the production INSERT_REG_SQL so the
+    column list can't drift from the real register path.
+
+    Returns:
+        The generated registration ids, in spec order.
+    """
+    now = datetime.now(timezone.utc)
+    now_str = now.isoformat()
+    now_us = to_us(now)
+
+    ids = []
+    params = []
+    for spec in specs:
+        geometry = SphereGeometry(
+            type="sphere",
+            center=Location(
+                lat=spec["lat"], lon=spec["lon"], ele=spec.get("ele", 0)
+            ),
+            radius=spec["radius"],
+        )
+        bbox = compute_bounding_box(geometry)
+        reg_id = generate_registration_id()
+        ids.append(reg_id)
+        params.append(
+            (
+                reg_id,
+                owner,
+                geometry.type,
+                geometry.center.lat,
+                geometry.center.lon,
+                geometry.center.ele,
+                geometry.radius,
+                spec.get("service_point"),
+                int(spec.get("foad", False)),
+                origin_server,
+                reg_id,
+                1,
+                now_str,
+                now_str,
+                now_us,
+                bbox.min_lat,
+                bbox.max_lat,
+                bbox.min_lon,
+                bbox.max_lon,
+            )
+        )
+
+    with get_cursor() as cursor:
+        cursor.executemany(INSERT_REG_SQL, params)
+    return ids
@@ -2,21 +2,27 @@
 
 import importlib
 import os
-import tempfile
 import uuid
 
 import pytest
 from fastapi.testclient import TestClient
 
+# KDF cost dominates auth-heavy tests; 4 rounds is bcrypt's minimum and
+# plenty for fixtures. Applies to every test module (set before any
+# fixture reloads mrs_server.config).
+os.environ.setdefault("MRS_BCRYPT_ROUNDS", "4")
+
 
 @pytest.fixture(scope="function")
 def temp_db_path():
-    """Create a temporary database path."""
-    fd, path = tempfile.mkstemp(suffix=".db")
-    os.close(fd)
-    yield path
-    if os.path.exists(path):
-        os.unlink(path)
+    """Shared-cache in-memory database URI, unique per test.
+
+    All server connections (writer plus reader pool) share one in-memory
+    database through SQLite's shared cache, so tests pay no file or fsync
+    costs; the unique name isolates tests from each other and the database
+    evaporates when the writer connection closes.
+    """
+    return f"file:memdb_{uuid.uuid4().hex}?mode=memory&cache=shared"
 
 
 @pytest.fixture(scope="function")
@@ -32,10 +38,8 @@ def client(temp_db_path):
     import mrs_server.config
     import mrs_server.database
 
-    # Close any existing connection
-    if mrs_server.database._connection is not None:
-        mrs_server.database._connection.close()
-    mrs_server.database._connection = None
+    # Close any existing connections
+    mrs_server.database.close_database()
     mrs_server.database._db_path = None
 
     # Reload config to pick up new environment
@@ -47,6 +51,9 @@ def client(temp_db_path):
     import mrs_server.auth.keys
     import mrs_server.auth.dependencies
     import mrs_server.auth
+    import mrs_server.federation.peers
+    import mrs_server.federation.referrals
+    import mrs_server.federation
     import mrs_server.api.auth
     import mrs_server.api.register
     import mrs_server.api.release
@@ -59,6 +66,11 @@ def client(temp_db_path):
     importlib.reload(mrs_server.auth.keys)
     importlib.reload(mrs_server.auth.dependencies)
     importlib.reload(mrs_server.auth)
+    # Federation modules hold cross-test state (peer version counter,
+    # cached peer list, referral index, last_seen debounce timestamps)
+    importlib.reload(mrs_server.federation.peers)
+    importlib.reload(mrs_server.federation.referrals)
+    importlib.reload(mrs_server.federation)
     importlib.reload(mrs_server.api.auth)
     importlib.reload(mrs_server.api.register)
     importlib.reload(mrs_server.api.release)
@@ -211,6 +211,38 @@ class TestRoundTrip:
         urls = {p["server_url"] for p in export_data["peers"]}
         assert "https://sydney.mrs.example" in urls
 
+    def test_imported_peers_appear_in_well_known(self, client):
+        """Import must invalidate the peer caches, not just write the table."""
+        # Prime the version-keyed caches with the pre-import (empty) peer set
+        before = client.get("/.well-known/mrs").json()
+        assert all(
+            p["server"] != "https://melbourne.mrs.example" for p in before["known_peers"]
+        )
+
+        peer_data = {
+            "registrations": [],
+            "tombstones": [],
+            "peers": [
+                {
+                    "server_url": "https://melbourne.mrs.example",
+                    "hint": "Melbourne metro",
+                    "last_seen": "2026-03-07T00:00:00+00:00",
+                    "is_configured": False,
+                    "authoritative_regions": None,
+                },
+            ],
+        }
+        resp = client.post(
+            "/admin/import",
+            content=json.dumps(peer_data),
+            headers={"Content-Type": "application/json"},
+        )
+        assert resp.status_code == 200
+
+        after = client.get("/.well-known/mrs").json()
+        servers = {p["server"] for p in after["known_peers"]}
+        assert "https://melbourne.mrs.example" in servers
+
     def test_search_finds_imported_data(self, client, auth_headers):
         """Data loaded via import should be searchable."""
         self._register(client, auth_headers, -33.8568, 151.2153, 50, "https://example.com/imported")
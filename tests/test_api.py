@@ -1,10 +1,20 @@
 """Tests for MRS API endpoints."""
 
-from datetime import datetime, timezone
-
 import pytest
 
-from mrs_server.database import get_cursor
+from tests._db_helpers import bulk_register, insert_replica
+
+# Canonical valid /register body; tests never mutate it, they spread it
+# with per-test overrides ({**_BASE_REG_PAYLOAD, "service_point": ...})
+_BASE_REG_PAYLOAD = {
+    "space": {
+        "type": "sphere",
+        "center": {"lat": -33.8568, "lon": 151.2153, "ele": 0},
+        "radius": 50,
+    },
+    "service_point": "https://example.com/my-space",
+    "foad": False,
+}
 
 
 class TestRootEndpoints:
@@ -105,19 +115,7 @@ class TestRegistration:
     def test_register_space(self, client, test_user):
         """Should be able to register a space."""
         headers = {"Authorization": f"Bearer {test_user['token']}"}
-        response = client.post(
-            "/register",
-            headers=headers,
-            json={
-                "space": {
-                    "type": "sphere",
-                    "center": {"lat": -33.8568, "lon": 151.2153, "ele": 0},
-                    "radius": 50,
-                },
-                "service_point": "https://example.com/my-space",
-                "foad": False,
-            },
-        )
+        response = client.post("/register", headers=headers, json=_BASE_REG_PAYLOAD)
         assert response.status_code == 201
         data = response.json()
         assert data["status"] == "registered"
@@ -132,15 +130,7 @@ class TestRegistration:
         create = client.post(
             "/register",
             headers=auth_headers,
-            json={
-                "space": {
-                    "type": "sphere",
-                    "center": {"lat": -33.8568, "lon": 151.2153, "ele": 0},
-                    "radius": 50,
-                },
-                "service_point": "https://example.com/v1",
-                "foad": False,
-            },
+            json={**_BASE_REG_PAYLOAD, "service_point": "https://example.com/v1"},
         )
         assert create.status_code == 201
         reg = create.json()["registration"]
@@ -150,13 +140,9 @@ class TestRegistration:
             f"/register/{reg['id']}",
             headers=auth_headers,
             json={
-                "space": {
-                    "type": "sphere",
-                    "center": {"lat": -33.8568, "lon": 151.2153, "ele": 0},
-                    "radius": 60,
-                },
+                **_BASE_REG_PAYLOAD,
+                "space": {**_BASE_REG_PAYLOAD["space"], "radius": 60},
                 "service_point": "https://example.com/v2",
-                "foad": False,
             },
         )
         assert update.status_code == 200
@@ -166,53 +152,15 @@ class TestRegistration:
 
     def test_update_non_authoritative_registration_rejected(self, client, auth_headers):
         """Should reject updates for replicated (non-authoritative) registrations."""
-        now = datetime.now(timezone.utc).isoformat()
-        with get_cursor() as cur:
-            cur.execute("SELECT id FROM users WHERE id = (SELECT user_id FROM tokens LIMIT 1)")
-            owner = cur.fetchone()["id"]
-            cur.execute(
-                """
-                INSERT INTO registrations (
-                    id, owner, geo_type,
-                    center_lat, center_lon, center_ele, radius,
-                    service_point, foad,
-                    origin_server, origin_id, version,
-                    created_at, updated_at,
-                    bbox_min_lat, bbox_max_lat, bbox_min_lon, bbox_max_lon
-                ) VALUES (?, ?, 'sphere', ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    "reg_replica_1",
-                    owner,
-                    -33.8568,
-                    151.2153,
-                    0.0,
-                    50.0,
-                    "https://example.com/replica",
-                    0,
-                    "https://origin.example",
-                    "reg_origin_1",
-                    3,
-                    now,
-                    now,
-                    -33.8573,
-                    -33.8563,
-                    151.2148,
-                    151.2158,
-                ),
-            )
+        insert_replica("reg_replica_1", "reg_origin_1", version=3)
 
         response = client.put(
             "/register/reg_replica_1",
             headers=auth_headers,
             json={
-                "space": {
-                    "type": "sphere",
-                    "center": {"lat": -33.8568, "lon": 151.2153, "ele": 0},
-                    "radius": 60,
-                },
+                **_BASE_REG_PAYLOAD,
+                "space": {**_BASE_REG_PAYLOAD["space"], "radius": 60},
                 "service_point": "https://example.com/new",
-                "foad": False,
             },
         )
         assert response.status_code == 409
@@ -221,97 +169,64 @@ class TestRegistration:
         assert detail["origin_server"] == "https://origin.example"
         assert detail["origin_id"] == "reg_origin_1"
 
-    def test_register_space_foad(self, client, auth_headers):
-        """Should be able to register with foad=true and no service_point."""
-        response = client.post(
-            "/register",
-            headers=auth_headers,
-            json={
-                "space": {
-                    "type": "sphere",
-                    "center": {"lat": -33.8568, "lon": 151.2153, "ele": 0},
-                    "radius": 50,
+    @pytest.mark.parametrize(
+        "overrides, needs_auth, expected_status",
+        [
+            pytest.param(
+                {"service_point": None, "foad": True},
+                True,
+                201,
+                id="foad-no-service-point",
+            ),
+            pytest.param(
+                {"service_point": None}, True, 400, id="missing-service-point"
+            ),
+            pytest.param({}, False, 401, id="no-auth"),
+            pytest.param(
+                {
+                    "space": {
+                        "type": "sphere",
+                        "center": {"lat": 100, "lon": 200, "ele": 0},
+                        "radius": 50,
+                    }
                 },
-                "foad": True,
-            },
-        )
-        assert response.status_code == 201
+                True,
+                422,
+                id="invalid-coordinates",
+            ),
+            pytest.param(
+                {"service_point": "javascript:alert(1)"},
+                True,
+                422,
+                id="non-https-service-point",
+            ),
+            pytest.param(
+                {"service_point": "https://example.com/x#prompt"},
+                True,
+                422,
+                id="fragment-in-service-point",
+            ),
+        ],
+    )
+    def test_register_validation(
+        self, client, auth_headers, overrides, needs_auth, expected_status
+    ):
+        """Register status matrix: each case is the happy-path payload
+        with one variation; a None override removes the field entirely.
+        """
+        payload = {**_BASE_REG_PAYLOAD, **overrides}
+        payload = {k: v for k, v in payload.items() if v is not None}
 
-    def test_register_space_missing_service_point(self, client, auth_headers):
-        """Should fail without service_point when foad=false."""
         response = client.post(
             "/register",
-            headers=auth_headers,
-            json={
-                "space": {
-                    "type": "sphere",
-                    "center": {"lat": -33.8568, "lon": 151.2153, "ele": 0},
-                    "radius": 50,
-                },
-                "foad": False,
-            },
+            headers=auth_headers if needs_auth else None,
+            json=payload,
         )
-        assert response.status_code == 400
-
-    def test_register_space_no_auth(self, client):
-        """Should fail without authentication."""
-        response = client.post(
-            "/register",
-            json={
-                "space": {
-                    "type": "sphere",
-                    "center": {"lat": -33.8568, "lon": 151.2153, "ele": 0},
-                    "radius": 50,
-                },
-                "service_point": "https://example.com/my-space",
-            },
-        )
-        assert response.status_code == 401
-
-    def test_register_invalid_coordinates(self, client, auth_headers):
-        """Should reject invalid coordinates."""
-        response = client.post(
-            "/register",
-            headers=auth_headers,
-            json={
-                "space": {
-                    "type": "sphere",
-                    "center": {"lat": 100, "lon": 200, "ele": 0},  # Invalid
-                    "radius": 50,
-                },
-                "service_point": "https://example.com/my-space",
-            },
-        )
-        assert response.status_code == 422  # Validation error
-
-    def test_register_rejects_non_https_service_point(self, client, auth_headers):
-        """Should reject non-HTTPS service_point URIs."""
-        response = client.post(
-            "/register",
-            headers=auth_headers,
-            json={
-                "space": {
-                    "type": "sphere",
-                    "center": {"lat": -33.8568, "lon": 151.2153, "ele": 0},
-                    "radius": 50,
-                },
-                "service_point": "javascript:alert(1)",
-                "foad": False,
-            },
-        )
-        assert response.status_code == 422
+        assert response.status_code == expected_status
 
     def test_register_rejects_duplicate(self, client, auth_headers):
         """Should reject a registration that duplicates an existing one."""
-        payload = {
-            "space": {
-                "type": "sphere",
-                "center": {"lat": -33.8568, "lon": 151.2153, "ele": 0},
-                "radius": 50,
-            },
-            "service_point": "https://example.com/my-space",
-            "foad": False,
-        }
+        payload = _BASE_REG_PAYLOAD
         # First registration succeeds
         r1 = client.post("/register", headers=auth_headers, json=payload)
         assert r1.status_code == 201
@@ -324,21 +239,17 @@ class TestRegistration:
 
     def test_register_allows_different_service_point_same_location(self, client, auth_headers):
         """Same location but different service_point is NOT a duplicate."""
-        base = {
-            "space": {
-                "type": "sphere",
-                "center": {"lat": -33.8568, "lon": 151.2153, "ele": 0},
-                "radius": 50,
-            },
-            "foad": False,
-        }
         r1 = client.post(
-            "/register", headers=auth_headers, json={**base, "service_point": "https://example.com/a"}
+            "/register",
+            headers=auth_headers,
+            json={**_BASE_REG_PAYLOAD, "service_point": "https://example.com/a"},
         )
         assert r1.status_code == 201
 
         r2 = client.post(
-            "/register", headers=auth_headers, json={**base, "service_point": "https://example.com/b"}
+            "/register",
+            headers=auth_headers,
+            json={**_BASE_REG_PAYLOAD, "service_point": "https://example.com/b"},
         )
         assert r2.status_code == 201
 
@@ -347,15 +258,7 @@ class TestRegistration:
         r1 = client.post(
             "/register",
             headers=auth_headers,
-            json={
-                "space": {
-                    "type": "sphere",
-                    "center": {"lat": -33.8568, "lon": 151.2153, "ele": 0},
-                    "radius": 50,
-                },
-                "service_point": "https://example.com/multi",
-                "foad": False,
-            },
+            json={**_BASE_REG_PAYLOAD, "service_point": "https://example.com/multi"},
         )
         assert r1.status_code == 201
 
@@ -363,34 +266,16 @@ class TestRegistration:
             "/register",
             headers=auth_headers,
             json={
+                **_BASE_REG_PAYLOAD,
                 "space": {
-                    "type": "sphere",
+                    **_BASE_REG_PAYLOAD["space"],
                     "center": {"lat": 40.7484, "lon": -73.9857, "ele": 0},
-                    "radius": 50,
                 },
                 "service_point": "https://example.com/multi",
-                "foad": False,
             },
         )
         assert r2.status_code == 201
 
-    def test_register_rejects_fragment_in_service_point(self, client, auth_headers):
-        """Should reject service_point URIs with fragments."""
-        response = client.post(
-            "/register",
-            headers=auth_headers,
-            json={
-                "space": {
-                    "type": "sphere",
-                    "center": {"lat": -33.8568, "lon": 151.2153, "ele": 0},
-                    "radius": 50,
-                },
-                "service_point": "https://example.com/x#prompt",
-                "foad": False,
-            },
-        )
-        assert response.status_code == 422
-
 
 class TestRelease:
     """Tests for release endpoint."""
@@ -399,16 +284,7 @@ class TestRelease:
         """Should be able to release own registration."""
         # First create a registration
         create_response = client.post(
-            "/register",
-            headers=auth_headers,
-            json={
-                "space": {
-                    "type": "sphere",
-                    "center": {"lat": -33.8568, "lon": 151.2153, "ele": 0},
-                    "radius": 50,
-                },
-                "service_point": "https://example.com/my-space",
-            },
+            "/register", headers=auth_headers, json=_BASE_REG_PAYLOAD
         )
         reg_id = create_response.json()["registration"]["id"]
 
@@ -423,41 +299,12 @@ class TestRelease:
 
     def test_release_non_authoritative_registration_rejected(self, client, auth_headers):
         """Should reject release for replicated (non-authoritative) registrations."""
-        now = datetime.now(timezone.utc).isoformat()
-        with get_cursor() as cur:
-            cur.execute("SELECT id FROM users WHERE id = (SELECT user_id FROM tokens LIMIT 1)")
-            owner = cur.fetchone()["id"]
-            cur.execute(
-                """
-                INSERT INTO registrations (
-                    id, owner, geo_type,
-                    center_lat, center_lon, center_ele, radius,
-                    service_point, foad,
-                    origin_server, origin_id, version,
-                    created_at, updated_at,
-                    bbox_min_lat, bbox_max_lat, bbox_min_lon, bbox_max_lon
-                ) VALUES (?, ?, 'sphere', ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    "reg_replica_2",
-                    owner,
-                    -33.8568,
-                    151.2153,
-                    0.0,
-                    50.0,
-                    "https://example.com/replica2",
-                    0,
-                    "https://origin.example",
-                    "reg_origin_2",
-                    2,
-                    now,
-                    now,
-                    -33.8573,
-                    -33.8563,
-                    151.2148,
-                    151.2158,
-                ),
-            )
+        insert_replica(
+            "reg_replica_2",
+            "reg_origin_2",
+            version=2,
+            service_point="https://example.com/replica2",
+        )
 
         response = client.post(
             "/release",
@@ -483,21 +330,17 @@ class TestRelease:
 class TestSync:
     """Tests for sync endpoints."""
 
-    def test_sync_snapshot_returns_registrations(self, client, auth_headers):
-        create = client.post(
-            "/register",
-            headers=auth_headers,
-            json={
-                "space": {
-                    "type": "sphere",
-                    "center": {"lat": -33.8568, "lon": 151.2153, "ele": 0},
+    def test_sync_snapshot_returns_registrations(self, client):
+        bulk_register(
+            [
+                {
+                    "lat": -33.8568,
+                    "lon": 151.2153,
                     "radius": 50,
-                },
-                "service_point": "https://example.com/sync-a",
-                "foad": False,
-            },
+                    "service_point": "https://example.com/sync-a",
+                }
+            ]
         )
-        assert create.status_code == 201
 
         snap = client.get("/sync/snapshot")
         assert snap.status_code == 200
@@ -509,22 +352,21 @@ class TestSync:
         assert "origin_id" in reg
         assert "version" in reg
 
-    def test_sync_changes_includes_tombstones(self, client, auth_headers):
-        create = client.post(
-            "/register",
-            headers=auth_headers,
-            json={
-                "space": {
-                    "type": "sphere",
-                    "center": {"lat": -33.8568, "lon": 151.2153, "ele": 0},
+    def test_sync_changes_includes_tombstones(self, client, test_user):
+        # Inserted directly (owned by the test user so /release is allowed);
+        # the register path has its own coverage in TestRegistration
+        [reg_id] = bulk_register(
+            [
+                {
+                    "lat": -33.8568,
+                    "lon": 151.2153,
                     "radius": 50,
-                },
-                "service_point": "https://example.com/sync-b",
-                "foad": False,
-            },
+                    "service_point": "https://example.com/sync-b",
+                }
+            ],
+            owner=test_user["identity"],
         )
-        assert create.status_code == 201
-        reg_id = create.json()["registration"]["id"]
+        auth_headers = {"Authorization": f"Bearer {test_user['token']}"}
 
         since = "1970-01-01T00:00:00+00:00"
         changes_before = client.get("/sync/changes", params={"since": since})
@@ -596,20 +438,11 @@ class TestSearch:
         assert result["created"] == reg_data["created"]
         assert result["updated"] == reg_data["updated"]
 
-    def test_search_excludes_foad(self, client, auth_headers):
+    def test_search_excludes_foad(self, client):
         """Search should not return foad registrations."""
         # Create a foad registration
-        client.post(
-            "/register",
-            headers=auth_headers,
-            json={
-                "space": {
-                    "type": "sphere",
-                    "center": {"lat": -33.8568, "lon": 151.2153, "ele": 0},
-                    "radius": 50,
-                },
-                "foad": True,
-            },
+        bulk_register(
+            [{"lat": -33.8568, "lon": 151.2153, "radius": 50, "foad": True}]
         )
 
         # Search should find nothing
@@ -675,34 +508,24 @@ class TestSearch:
         assert result["created"] == reg_data["created"]
         assert result["updated"] == reg_data["updated"]
 
-    def test_search_sorts_by_volume(self, client, auth_headers):
+    def test_search_sorts_by_volume(self, client):
         """Search results should be sorted by volume (smallest first)."""
-        # Create a large registration
-        client.post(
-            "/register",
-            headers=auth_headers,
-            json={
-                "space": {
-                    "type": "sphere",
-                    "center": {"lat": -33.8568, "lon": 151.2153, "ele": 0},
+        # One large and one small registration, inserted in one transaction
+        bulk_register(
+            [
+                {
+                    "lat": -33.8568,
+                    "lon": 151.2153,
                     "radius": 500,
+                    "service_point": "https://example.com/large",
                 },
-                "service_point": "https://example.com/large",
-            },
-        )
-
-        # Create a small registration
-        client.post(
-            "/register",
-            headers=auth_headers,
-            json={
-                "space": {
-                    "type": "sphere",
-                    "center": {"lat": -33.8568, "lon": 151.2153, "ele": 0},
+                {
+                    "lat": -33.8568,
+                    "lon": 151.2153,
                     "radius": 10,
+                    "service_point": "https://example.com/small",
                 },
-                "service_point": "https://example.com/small",
-            },
+            ]
         )
 
         # Search
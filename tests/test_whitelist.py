@@ -3,7 +3,6 @@
 import importlib
 import json
 import os
-import tempfile
 import uuid
 
 import pytest
@@ -20,8 +19,8 @@ def _get_require_localhost():
 @pytest.fixture(scope="function")
 def whitelist_client():
     """Create a test client with whitelist enforcement enabled."""
-    fd, path = tempfile.mkstemp(suffix=".db")
-    os.close(fd)
+    # Shared-cache in-memory database, as in conftest.temp_db_path
+    path = f"file:memdb_{uuid.uuid4().hex}?mode=memory&cache=shared"
 
     os.environ["MRS_DATABASE_PATH"] = path
     os.environ["MRS_SERVER_URL"] = "http://testserver"
@@ -32,9 +31,7 @@ def whitelist_client():
     import mrs_server.config
     import mrs_server.database
 
-    if mrs_server.database._connection is not None:
-        mrs_server.database._connection.close()
-    mrs_server.database._connection = None
+    mrs_server.database.close_database()
     mrs_server.database._db_path = None
 
     importlib.reload(mrs_server.config)
@@ -69,8 +66,6 @@ def whitelist_client():
 
     # Clean up env
     os.environ.pop("MRS_REGISTRATION_REQUIRES_WHITELIST", None)
-    if os.path.exists(path):
-        os.unlink(path)
 
 
 @pytest.fixture(autouse=True)